@@ -1,22 +1,35 @@
 """Internal implementation of SyftFile and SyftFolder classes with ACL compatibility."""
 
+import errno
+import json
+import os
+import re
 import shutil
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, FrozenSet, List, Literal, Optional, Tuple, Union
 
 import yaml
 
 from ._utils import (
-    format_users,
+    _PERMISSION_LEVELS,
+    _add_formatted_user,
+    _atomic_write_yaml,
+    _load_syftpub,
+    _merge_rule_access,
+    _remove_formatted_user,
+    _rule_permissions,
+    _YamlLoader,
     is_datasite_email,
     read_syftpub_yaml,
-    read_syftpub_yaml_full,
     resolve_path,
     update_syftpub_yaml,
+    update_syftpub_yaml_rules,
 )
 from .core import (
     PermissionCache,
@@ -25,17 +38,33 @@ from .core import (
     _acl_norm_path,
     _calculate_glob_specificity,
     _doublestar_match,
-    _glob_match,
-    _is_owner,
-    _sort_rules_by_specificity,
+    _is_owner_in_scope,
+    _iter_matching_rules,
+    _resolve_datasite_owner,
+    _resolve_owner_scope,
     clear_permission_cache,
     get_cache_stats,
 )
 from .core.permissions import _permission_cache
 from .core.visualization import PermissionExplanation, ShareWidget
 
+try:
+    from tabulate import tabulate as _tabulate
+except ImportError:  # pragma: no cover - tabulate comes with the display extra
+    _tabulate = None  # type: ignore[assignment]
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional speedup for the offline viewer
+    _orjson = None  # type: ignore[assignment]
+
 FILE_LIMIT = "Blocked by {limit_type} limit"
 
+# Caps on the directory tree and file previews embedded by the offline (read-only) HTML viewer
+_OFFLINE_VIEWER_MAX_DEPTH = 3
+_OFFLINE_VIEWER_MAX_ENTRIES = 500
+_OFFLINE_VIEWER_MAX_CHARS = 20000
+
 
 def _confirm_action(message: str, force: bool = False) -> bool:
     """
@@ -55,6 +84,354 @@ def _confirm_action(message: str, force: bool = False) -> bool:
     return response in ["y", "yes"]
 
 
+def _dumps_json(data: Any) -> str:
+    """Serialize data to compact JSON, using orjson when it is installed."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass  # Undecodable filenames carry lone surrogates, which orjson rejects
+    # ASCII output escapes those surrogates, so the page still encodes as UTF-8
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _read_text_preview(path: Path) -> str:
+    """Return the start of a file as UTF-8 text, truncated for the offline viewer."""
+    with open(path, "rb") as f:
+        # A character never takes more than four bytes, so this covers one past the cap
+        raw = f.read(4 * (_OFFLINE_VIEWER_MAX_CHARS + 1) + 3)
+    content = raw.decode("utf-8", "replace")
+    if "\r" in content:
+        # Match the newline translation of a text-mode read
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    if len(content) > _OFFLINE_VIEWER_MAX_CHARS:
+        content = content[:_OFFLINE_VIEWER_MAX_CHARS] + "\n\n… (truncated)"
+    return content
+
+
+def _read_text_previews(paths: List[Path]) -> List[str]:
+    """Read previews for several files in order, overlapping the reads on a thread pool."""
+
+    def read(path: Path) -> str:
+        try:
+            return _read_text_preview(path)
+        except Exception:
+            return ""
+
+    if len(paths) < 2:
+        return [read(path) for path in paths]
+    with ThreadPoolExecutor() as pool:
+        return list(pool.map(read, paths))
+
+
+def _build_offline_viewer_data(start_path: Path) -> Dict[str, Any]:
+    """Walk a capped tree under start_path into the listings the offline viewer embeds."""
+    directories: dict = {}
+    files: dict = {}
+    # Previews are read together once the walk is done
+    previews: List[Tuple[dict, Path]] = []
+
+    # Walk breadth-first and stop at the caps, so a large tree keeps the
+    # entries nearest to the root instead of freezing the render
+    pending = deque([(start_path, 0)])
+    entry_count = 0
+    # Set once anything is left out, so the viewer can say the listing was cut
+    truncated = False
+    while pending and entry_count < _OFFLINE_VIEWER_MAX_ENTRIES:
+        dir_path, depth = pending.popleft()
+        try:
+            items = []
+            dir_truncated = False
+            # scandir entries carry the file type, so sorting and the
+            # directory checks below don't need a stat per child
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: (not e.is_dir(), e.name.lower()))
+            for entry in entries:
+                if entry_count >= _OFFLINE_VIEWER_MAX_ENTRIES:
+                    dir_truncated = True
+                    break
+                child = Path(entry.path)
+                try:
+                    is_dir = entry.is_dir()
+                    stat = entry.stat()
+                    # Format modified date as ISO string like the server-backed API
+                    modified_iso = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    item_info = {
+                        "name": entry.name,
+                        "path": entry.path,
+                        "is_directory": is_dir,
+                        "size": None if is_dir else stat.st_size,
+                        "modified": modified_iso,
+                        "is_editable": False,  # read-only fallback
+                        "extension": child.suffix.lower() if not is_dir else None,
+                    }
+                except Exception:
+                    continue
+                items.append(item_info)
+                entry_count += 1
+
+                if is_dir:
+                    if depth < _OFFLINE_VIEWER_MAX_DEPTH:
+                        pending.append((child, depth + 1))
+                    else:
+                        truncated = True
+                else:
+                    files[str(child)] = file_info = {
+                        "path": str(child),
+                        "content": "",
+                        "size": stat.st_size,
+                        "modified": modified_iso,
+                        "extension": child.suffix.lower(),
+                        "encoding": "utf-8",
+                        "can_write": False,
+                        "can_admin": False,
+                        "write_users": [],
+                    }
+                    previews.append((file_info, child))
+            directories[str(dir_path)] = {
+                "path": str(dir_path),
+                "parent": str(dir_path.parent) if dir_path.parent != dir_path else None,
+                "items": items,
+                "total_items": len(entries) if dir_truncated else len(items),
+                "truncated": dir_truncated,
+                "can_admin": False,
+            }
+            truncated = truncated or dir_truncated
+        except Exception:
+            pass
+
+    contents = _read_text_previews([child for _, child in previews])
+    for (file_info, _), content in zip(previews, contents):
+        file_info["content"] = content
+    return {
+        "directories": directories,
+        "files": files,
+        "truncated": truncated or bool(pending),
+    }
+
+
+def _offline_viewer_html(path: Path, is_dark_mode: bool, syft_user: Optional[str]) -> str:
+    """Render the read-only editor for path with its API calls answered from embedded data."""
+    from .filesystem_editor import generate_editor_html
+
+    # Serialize straight away so the file previews aren't held twice
+    data_json = _dumps_json(_build_offline_viewer_data(path.parent))
+
+    # JavaScript stub to override the editor's fetch with local data
+    stub_script = f"""
+<script>
+(function() {{
+  const LOCAL_DATA = {data_json};
+  function makeResp(obj, status = 200) {{
+    return Promise.resolve(new Response(JSON.stringify(obj), {{status: status, headers: {{'Content-Type': 'application/json'}}}}));
+  }}
+  window.fetch = function(url, opts) {{
+    try {{
+      const u = new URL(url, window.location.origin);
+      if (u.pathname.startsWith('/api/filesystem/list')) {{
+        const p = decodeURIComponent(u.searchParams.get('path') || '');
+        if (LOCAL_DATA.directories[p]) return makeResp(LOCAL_DATA.directories[p]);
+        if (LOCAL_DATA.truncated) {{
+          return makeResp({{detail: 'Not included in the offline viewer (listing truncated)'}}, 413);
+        }}
+      }}
+      if (u.pathname.startsWith('/api/filesystem/read')) {{
+        const p = decodeURIComponent(u.searchParams.get('path') || '');
+        if (LOCAL_DATA.files[p]) return makeResp(LOCAL_DATA.files[p]);
+      }}
+    }} catch (e) {{}}
+    return Promise.reject(new Error('Offline read-only viewer'));
+  }};
+}})();
+</script>
+"""
+
+    # The editor emits the stub ahead of its own scripts
+    return generate_editor_html(
+        initial_path=str(path),
+        is_dark_mode=is_dark_mode,
+        syft_user=syft_user,
+        head_script=stub_script,
+    )
+
+
+def _move_path(src: Path, dst: Path) -> None:
+    """Move src to dst with a single rename, copying only across filesystems."""
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
+
+
+# Permission levels that imply each permission, strongest first (Admin > Write > Create > Read)
+_IMPLIED_BY = {
+    "admin": ("admin",),
+    "write": ("admin", "write"),
+    "create": ("admin", "write", "create"),
+    "read": ("admin", "write", "create", "read"),
+}
+
+
+def _granting_level(perms: Dict[str, List[str]], user: str, permission: str) -> Optional[str]:
+    """Return the strongest permission level that grants ``permission`` to ``user``, if any."""
+    for level in _IMPLIED_BY[permission]:
+        users = perms.get(level, [])
+        if "*" in users or user in users:
+            return level
+    return None
+
+
+def _has_permission(perms: Dict[str, List[str]], user: str, permission: str) -> bool:
+    """Check the permission hierarchy following old syftbox logic."""
+    return _granting_level(perms, user, permission) is not None
+
+
+def _with_user_sets(perm_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``perm_data`` with its user lists as frozensets, for explaining many users."""
+    permissions = {level: frozenset(users) for level, users in perm_data["permissions"].items()}
+    return {**perm_data, "permissions": permissions}
+
+
+def _explain_permission(
+    perm_data: Dict[str, Any], user: str, permission: str
+) -> tuple[bool, List[str]]:
+    """
+    Check the permission hierarchy and collect human readable reasons.
+
+    Args:
+        perm_data: Result of ``_get_all_permissions_with_sources``
+        user: User to check
+        permission: Permission level being checked
+
+    Returns:
+        tuple: (has_permission, reasons)
+    """
+    reasons: List[str] = []
+    all_perms = perm_data["permissions"]
+    sources = perm_data["sources"]
+    terminal = perm_data.get("terminal")
+    matched_pattern = perm_data.get("matched_pattern")
+
+    # If blocked by terminal
+    if terminal and not any(all_perms.values()):
+        reasons.append(f"Blocked by terminal at {terminal.parent}")
+        return False, reasons
+
+    level = _granting_level(all_perms, user, permission)
+    has_permission = level is not None
+    level_sources = sources.get(level) if level is not None else None
+    if level_sources:
+        src = level_sources[0]
+        if level == permission:
+            reasons.append(f"Explicitly granted {level} in {src['path'].parent}")
+        else:
+            reasons.append(f"Included via {level} permission in {src['path'].parent}")
+
+    # Add pattern info only for the specific permission being checked
+    # (not for inherited permissions - that would be confusing)
+    permission_sources = level_sources if level == permission else sources.get(permission)
+    if permission_sources:
+        for src in permission_sources:
+            if src["pattern"]:
+                # Show the pattern that was matched for this specific permission
+                reasons.append(f"Pattern '{src['pattern']}' matched")
+                break
+
+    # If we don't have permission but a pattern was matched (terminal or non-terminal),
+    # it means the rule was evaluated but didn't grant this permission
+    elif matched_pattern and not has_permission:
+        reasons.append(f"Pattern '{matched_pattern}' matched")
+
+    # Check for public access
+    if "*" in all_perms.get(permission, []):
+        reasons.append("Public access (*)")
+
+    if not has_permission and not reasons:
+        reasons.append("No permission found")
+
+    return has_permission, reasons
+
+
+# Extracts the pattern from reasons like "[Read] Pattern 'docs/*.md' matched"
+_PATTERN_REASON_RE = re.compile(r"Pattern '(.*?)' matched")
+
+
+def _dedup_reasons(permission_reasons: List[str]) -> List[str]:
+    """
+    Consolidate level-prefixed reasons for display.
+
+    Pattern matches are reported once without their permission-level prefix;
+    any other reason keeps its prefix and is only dropped when repeated.
+    """
+    unique_reasons = []
+    seen_patterns = set()
+    seen_other = set()
+
+    for reason in permission_reasons:
+        match = _PATTERN_REASON_RE.search(reason)
+        if match is not None:
+            pattern = match.group(1)
+            if pattern and pattern not in seen_patterns:
+                seen_patterns.add(pattern)
+                unique_reasons.append(f"Pattern '{pattern}' matched")
+        elif reason not in seen_other:
+            seen_other.add(reason)
+            unique_reasons.append(reason)
+
+    return unique_reasons
+
+
+# Table reason prefixes, and the stronger levels whose inherited reasons each level omits
+_TABLE_REASON_LEVELS = (
+    ("admin", "[Admin]", ()),
+    ("write", "[Write]", ("Included via admin permission",)),
+    (
+        "create",
+        "[Create]",
+        ("Included via write permission", "Included via admin permission"),
+    ),
+    (
+        "read",
+        "[Read]",
+        (
+            "Included via create permission",
+            "Included via write permission",
+            "Included via admin permission",
+        ),
+    ),
+)
+
+
+def _permission_table_row(label: str, results: Dict[str, tuple[bool, List[str]]]) -> List[str]:
+    """Build one permission table row from a user's per-level ``(granted, reasons)``."""
+    # Collect reasons with permission level prefixes, skipping plain hierarchy
+    permission_reasons = []
+    for level, prefix, inherited in _TABLE_REASON_LEVELS:
+        granted, reasons = results[level]
+        if granted:
+            for reason in reasons:
+                if not any(marker in reason for marker in inherited):
+                    permission_reasons.append(f"{prefix} {reason}")
+
+    # Format reasons for display
+    if not permission_reasons and not any(granted for granted, _ in results.values()):
+        reason_text = "No permissions found"
+    else:
+        # Smart deduplication: consolidate pattern matches across permission levels
+        reason_text = "; ".join(_dedup_reasons(permission_reasons))
+
+    return [
+        label,
+        "✓" if results["read"][0] else "",
+        "✓" if results["create"][0] else "",
+        "✓" if results["write"][0] else "",
+        "✓" if results["admin"][0] else "",
+        reason_text,
+    ]
+
+
 class SyftFile:
     """A file wrapper that manages SyftBox permissions."""
 
@@ -92,6 +469,26 @@ class SyftFile:
         """Get the file name"""
         return self._path.name
 
+    @cached_property
+    def _owner_scope(self) -> Tuple[Optional[str], FrozenSet[str]]:
+        """Path-derived data used to check ownership, resolved once per instance."""
+        return _resolve_owner_scope(str(self._path))
+
+    @cached_property
+    def _datasite_owner(self) -> Optional[str]:
+        """Owner of the datasite containing this path, resolved once per instance."""
+        return _resolve_datasite_owner(str(self._path))
+
+    @cached_property
+    def _path_parts(self) -> Tuple[str, ...]:
+        """Components of the path, used to slice out paths relative to ancestors."""
+        return self._path.parts
+
+    @cached_property
+    def _is_dir(self) -> bool:
+        """Whether the path is a directory, looked up once like the other limit metadata."""
+        return self._path.is_dir()
+
     @property
     def _permissions_dict(self) -> Dict[str, List[str]]:
         """Get all permissions for this file as a dictionary."""
@@ -103,15 +500,7 @@ class SyftFile:
         # Check if any yaml files were found during permission resolution
         # This is simpler: if we have ANY permissions (including "*"),
         # then yaml files exist
-        perms = self._get_all_permissions()
-
-        # Check each permission type
-        for permission_type, users in perms.items():
-            if users:  # If there are any users (including "*")
-                return True
-
-        # No permissions found means no yaml files processed this file
-        return False
+        return any(self._get_all_permissions().values())
 
     def _get_all_permissions(self) -> Dict[str, List[str]]:
         """Get all permissions for this file using old syftbox nearest-node algorithm."""
@@ -138,15 +527,15 @@ class SyftFile:
             parent_dir = current_path.parent
             syftpub_path = parent_dir / "syft.pub.yaml"
 
-            if syftpub_path.exists():
+            parsed = _load_syftpub(syftpub_path)
+            if parsed is not None:
                 try:
-                    with open(syftpub_path, "r") as f:
-                        content = yaml.safe_load(f) or {"rules": []}
+                    sorted_rules, is_terminal = parsed
 
-                    yaml_files.append((parent_dir, content))
+                    yaml_files.append((parent_dir, sorted_rules))
 
                     # If this is a terminal node, remember it and stop collecting
-                    if content.get("terminal", False) and terminal_found_at is None:
+                    if is_terminal and terminal_found_at is None:
                         terminal_found_at = parent_dir
                         break
 
@@ -155,107 +544,51 @@ class SyftFile:
 
             current_path = parent_dir
 
-        # Second pass: process yaml files from the terminal node (or root) down
-        # If we found a terminal node, only process that node's rules
+        # Second pass: a terminal node's rules take precedence over everything below it,
+        # so only that node (the last one collected) is evaluated
         if terminal_found_at is not None:
-            # Only process the terminal node's rules
-            for parent_dir, content in yaml_files:
-                if parent_dir == terminal_found_at:
-                    rules = content.get("rules", [])
-                    sorted_rules = _sort_rules_by_specificity(rules)
-                    for rule in sorted_rules:
-                        pattern = rule.get("pattern", "")
-                        # Check if pattern matches our file path relative to this directory
-                        rel_path = str(self._path.relative_to(parent_dir))
-                        if _glob_match(pattern, rel_path):
-                            access = rule.get("access", {})
-                            # Check file limits if present
-                            limits = rule.get("limits", {})
-                            if limits:
-                                # Check if directories are allowed
-                                if (
-                                    not limits.get("allow_dirs", True)
-                                    and self._path is not None
-                                    and self._path.is_dir()
-                                ):
-                                    continue  # Skip this rule for directories
-
-                                # Check if symlinks are allowed
-                                if not limits.get("allow_symlinks", True) and self._is_symlink:
-                                    continue  # Skip this rule for symlinks
-
-                                # Check file size limits
-                                max_file_size = limits.get("max_file_size")
-                                if max_file_size is not None:
-                                    if self._size > max_file_size:
-                                        continue  # Skip this rule if file exceeds size limit
-
-                            # Terminal rules: use first matching rule
-                            nearest_permissions = {
-                                perm: format_users(access.get(perm, []))
-                                for perm in ["read", "create", "write", "admin"]
-                            }
-                            break
-                    break
-        else:
-            # No terminal node found, use nearest-node algorithm
-            # Process from the file up, and use the FIRST matching rule found
-            for parent_dir, content in yaml_files:  # yaml_files is already in order from file up
-                rules = content.get("rules", [])
-                sorted_rules = _sort_rules_by_specificity(rules)
-                found_match = False
-
-                for rule in sorted_rules:
-                    pattern = rule.get("pattern", "")
-                    # Check if pattern matches our file path relative to this directory
-                    rel_path = (
-                        str(self._path.relative_to(parent_dir)) if self._path is not None else ""
-                    )
-                    if _glob_match(pattern, rel_path):
-                        access = rule.get("access", {})
-                        # Check file limits if present
-                        limits = rule.get("limits", {})
-                        if limits:
-                            # Check if directories are allowed
-                            if not limits.get("allow_dirs", True) and self._path.is_dir():
-                                continue  # Skip this rule for directories
-
-                            # Check if symlinks are allowed
-                            if not limits.get("allow_symlinks", True) and self._is_symlink:
-                                continue  # Skip this rule for symlinks
-
-                            # Check file size limits
-                            max_file_size = limits.get("max_file_size")
-                            if max_file_size is not None:
-                                if self._size > max_file_size:
-                                    continue  # Skip this rule if file exceeds size limit
-
-                        # Found the nearest matching rule
-                        nearest_permissions = {
-                            perm: format_users(access.get(perm, []))
-                            for perm in ["read", "create", "write", "admin"]
-                        }
-                        found_match = True
-                        break
-
-                # If we found a match in this yaml file, stop searching
-                if found_match:
-                    break
+            yaml_files = yaml_files[-1:]
+
+        # Use the FIRST matching rule found, from the file up (the nearest-node algorithm)
+        for parent_dir, sorted_rules in yaml_files:
+            found_match = False
+
+            # Check if pattern matches our file path relative to this directory
+            rel_path = "/".join(self._path_parts[len(parent_dir.parts) :])
+            for rule in _iter_matching_rules(sorted_rules, rel_path):
+                # Check file limits if present
+                limits = rule.get("limits", {})
+                if limits:
+                    # Check if directories are allowed
+                    if not limits.get("allow_dirs", True) and self._is_dir:
+                        continue  # Skip this rule for directories
+
+                    # Check if symlinks are allowed
+                    if not limits.get("allow_symlinks", True) and self._is_symlink:
+                        continue  # Skip this rule for symlinks
+
+                    # Check file size limits
+                    max_file_size = limits.get("max_file_size")
+                    if max_file_size is not None:
+                        if self._size > max_file_size:
+                            continue  # Skip this rule if file exceeds size limit
+
+                # Found the nearest matching rule
+                nearest_permissions = _rule_permissions(rule)
+                found_match = True
+                break
+
+            # If we found a match in this yaml file, stop searching
+            if found_match:
+                break
 
         # Add owner permissions: datasite owner gets full admin access
-        path_str = str(self._path)
-        if "datasites" in path_str:
-            # Extract datasite owner from path like: /path/to/SyftBox/datasites/user@domain.com/...
-            parts = path_str.split("datasites")
-            if len(parts) > 1:
-                datasites_relative = parts[-1].lstrip("/\\")
-                path_segments = datasites_relative.split("/")
-                if path_segments and "@" in path_segments[0]:
-                    datasite_owner = path_segments[0]
-                    # Grant full permissions to datasite owner
-                    for perm_type in ["read", "create", "write", "admin"]:
-                        if datasite_owner not in nearest_permissions[perm_type]:
-                            nearest_permissions[perm_type].append(datasite_owner)
+        datasite_owner = self._datasite_owner
+        if datasite_owner is not None:
+            # Grant full permissions to datasite owner
+            for perm_type in _PERMISSION_LEVELS:
+                if datasite_owner not in nearest_permissions[perm_type]:
+                    nearest_permissions[perm_type].append(datasite_owner)
 
         # Cache and return the effective permissions
         _permission_cache.set(cache_key, nearest_permissions)
@@ -268,179 +601,27 @@ class SyftFile:
         """
         perms = self._get_all_permissions()
 
-        # Get all unique users
-        all_users = set()
-        for users in perms.values():
-            all_users.update(users)
+        # Get all unique users, handling public separately
+        all_users = set().union(*perms.values())
+
+        # Every user and level below is explained against the same sources
+        perm_data = _with_user_sets(self._get_all_permissions_with_sources()) if all_users else None
+
+        has_public = "*" in all_users
+        all_users.discard("*")
 
         # Create table rows
         rows = []
 
         # First add public if it exists
-        if "*" in all_users:
-            # Collect all reasons for public
-
-            # Check each permission level and collect reasons
-            read_has, read_reasons = self._check_permission_with_reasons("*", "read")
-            create_has, create_reasons = self._check_permission_with_reasons("*", "create")
-            write_has, write_reasons = self._check_permission_with_reasons("*", "write")
-            admin_has, admin_reasons = self._check_permission_with_reasons("*", "admin")
-
-            # Collect reasons with permission level prefixes
-            permission_reasons = []
-
-            # Collect all reasons with their permission levels
-            if admin_has:
-                for reason in admin_reasons:
-                    permission_reasons.append(f"[Admin] {reason}")
-
-            if write_has:
-                for reason in write_reasons:
-                    # Skip if this is just hierarchy from admin
-                    if "Included via admin permission" not in reason:
-                        permission_reasons.append(f"[Write] {reason}")
-
-            if create_has:
-                for reason in create_reasons:
-                    # Skip if this is just hierarchy from write/admin
-                    if (
-                        "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Create] {reason}")
-
-            if read_has:
-                for reason in read_reasons:
-                    # Skip if this is just hierarchy from create/write/admin
-                    if (
-                        "Included via create permission" not in reason
-                        and "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Read] {reason}")
-
-            # Format reasons for display
-            if not permission_reasons and not any([read_has, create_has, write_has, admin_has]):
-                reason_text = "No permissions found"
-            else:
-                # Smart deduplication: consolidate pattern matches across permission levels
-                unique_reasons = []
-                seen_patterns = set()
-                seen_other = set()
-
-                for reason in permission_reasons:
-                    # Extract pattern from reason if it contains "Pattern"
-                    if "Pattern '" in reason and "matched" in reason:
-                        # Extract just the pattern part
-                        pattern_start = reason.find("Pattern '") + 9
-                        pattern_end = reason.find("' matched", pattern_start)
-                        if pattern_end > pattern_start:
-                            pattern = reason[pattern_start:pattern_end]
-                            if pattern not in seen_patterns:
-                                seen_patterns.add(pattern)
-                                # Add pattern match without permission level prefix
-                                unique_reasons.append(f"Pattern '{pattern}' matched")
-                    else:
-                        # For non-pattern reasons, keep the permission-level prefix
-                        if reason not in seen_other:
-                            seen_other.add(reason)
-                            unique_reasons.append(reason)
-
-                reason_text = "; ".join(unique_reasons)
-
-            rows.append(
-                [
-                    "public",
-                    "✓" if read_has else "",
-                    "✓" if create_has else "",
-                    "✓" if write_has else "",
-                    "✓" if admin_has else "",
-                    reason_text,
-                ]
-            )
-            all_users.remove("*")  # Remove so we don't process it again
+        if has_public:
+            results = self._check_all_permissions_with_reasons("*", perm_data)
+            rows.append(_permission_table_row("public", results))
 
         # Then add all other users
         for user in sorted(all_users):
-            # Collect all reasons for this user
-
-            # Check each permission level and collect reasons
-            read_has, read_reasons = self._check_permission_with_reasons(user, "read")
-            create_has, create_reasons = self._check_permission_with_reasons(user, "create")
-            write_has, write_reasons = self._check_permission_with_reasons(user, "write")
-            admin_has, admin_reasons = self._check_permission_with_reasons(user, "admin")
-
-            # Collect reasons with permission level prefixes
-            permission_reasons = []
-
-            # Collect all reasons with their permission levels
-            if admin_has:
-                for reason in admin_reasons:
-                    permission_reasons.append(f"[Admin] {reason}")
-
-            if write_has:
-                for reason in write_reasons:
-                    # Skip if this is just hierarchy from admin
-                    if "Included via admin permission" not in reason:
-                        permission_reasons.append(f"[Write] {reason}")
-
-            if create_has:
-                for reason in create_reasons:
-                    # Skip if this is just hierarchy from write/admin
-                    if (
-                        "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Create] {reason}")
-
-            if read_has:
-                for reason in read_reasons:
-                    # Skip if this is just hierarchy from create/write/admin
-                    if (
-                        "Included via create permission" not in reason
-                        and "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Read] {reason}")
-
-            # Format reasons for display
-            if not permission_reasons and not any([read_has, create_has, write_has, admin_has]):
-                reason_text = "No permissions found"
-            else:
-                # Smart deduplication: consolidate pattern matches across permission levels
-                unique_reasons = []
-                seen_patterns = set()
-                seen_other = set()
-
-                for reason in permission_reasons:
-                    # Extract pattern from reason if it contains "Pattern"
-                    if "Pattern '" in reason and "matched" in reason:
-                        # Extract just the pattern part
-                        pattern_start = reason.find("Pattern '") + 9
-                        pattern_end = reason.find("' matched", pattern_start)
-                        if pattern_end > pattern_start:
-                            pattern = reason[pattern_start:pattern_end]
-                            if pattern not in seen_patterns:
-                                seen_patterns.add(pattern)
-                                # Add pattern match without permission level prefix
-                                unique_reasons.append(f"Pattern '{pattern}' matched")
-                    else:
-                        # For non-pattern reasons, keep the permission-level prefix
-                        if reason not in seen_other:
-                            seen_other.add(reason)
-                            unique_reasons.append(reason)
-
-                reason_text = "; ".join(unique_reasons)
-
-            row = [
-                user,
-                "✓" if read_has else "",
-                "✓" if create_has else "",
-                "✓" if write_has else "",
-                "✓" if admin_has else "",
-                reason_text,
-            ]
-            rows.append(row)
+            results = self._check_all_permissions_with_reasons(user, perm_data)
+            rows.append(_permission_table_row(user, results))
 
         return rows
 
@@ -450,16 +631,14 @@ class SyftFile:
         if not rows:
             return f"SyftFile('{self._path}') - No permissions set"
 
-        try:
-            from tabulate import tabulate
-
-            table = tabulate(
+        if _tabulate is not None:
+            table = _tabulate(
                 rows,
                 headers=["User", "Read", "Create", "Write", "Admin", "Reason"],
                 tablefmt="simple",
             )
             return f"SyftFile('{self._path}')\n\n{table}"
-        except ImportError:
+        else:
             # Fallback to simple table format if tabulate not available
             result = [f"SyftFile('{self._path}')\n"]
             result.append("User               Read  Create  Write  Admin  Reason")
@@ -629,125 +808,7 @@ class SyftFile:
             # -----------------------------
             # Offline fallback (read-only)
             # -----------------------------
-            import html as _html
-            import json as _json
-            import uuid as _uuid
-            from pathlib import Path as _Path
-
-            from .filesystem_editor import generate_editor_html as _gen_html
-
-            is_dark_mode = is_dark()
-            # (no external import needed)
-
-            # Build static data for the in-browser stubbed API
-            root_dir = _Path(self._path).parent
-
-            def _build_local_data(start_path: _Path):
-                directories: dict = {}
-                files: dict = {}
-
-                def _recurse(dir_path: _Path):
-                    try:
-                        items = []
-                        for child in sorted(
-                            dir_path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower())
-                        ):
-                            try:
-                                stat = child.stat()
-                                # Format modified date as ISO string like the server-backed API
-                                modified_iso = datetime.fromtimestamp(stat.st_mtime).isoformat()
-                                item_info = {
-                                    "name": child.name,
-                                    "path": str(child),
-                                    "is_directory": child.is_dir(),
-                                    "size": None if child.is_dir() else stat.st_size,
-                                    "modified": modified_iso,
-                                    "is_editable": False,  # read-only fallback
-                                    "extension": (
-                                        child.suffix.lower() if not child.is_dir() else None
-                                    ),
-                                }
-                            except Exception:
-                                continue
-                            items.append(item_info)
-
-                            if child.is_dir():
-                                _recurse(child)
-                            else:
-                                try:
-                                    with open(child, "r", encoding="utf-8", errors="replace") as f:
-                                        content = f.read()
-                                except Exception:
-                                    content = ""
-                                if len(content) > 20000:
-                                    content = content[:20000] + "\n\n… (truncated)"
-                                files[str(child)] = {
-                                    "path": str(child),
-                                    "content": content,
-                                    "size": stat.st_size,
-                                    "modified": modified_iso,
-                                    "extension": child.suffix.lower(),
-                                    "encoding": "utf-8",
-                                    "can_write": False,
-                                    "can_admin": False,
-                                    "write_users": [],
-                                }
-                        directories[str(dir_path)] = {
-                            "path": str(dir_path),
-                            "parent": str(dir_path.parent) if dir_path.parent != dir_path else None,
-                            "items": items,
-                            "total_items": len(items),
-                            "can_admin": False,
-                        }
-                    except Exception:
-                        pass
-
-                _recurse(start_path)
-                return {"directories": directories, "files": files}
-
-            local_data = _build_local_data(root_dir)
-            data_json = _json.dumps(local_data)
-
-            # Base HTML from the editor (we'll stub out its network calls)
-            base_html = _gen_html(
-                initial_path=str(self._path),
-                is_dark_mode=is_dark_mode,
-                syft_user=getattr(self, "_syft_user", None),
-            )
-
-            # JavaScript stub to override fetch with local data
-            stub_script = f"""
-<script>
-(function() {{
-  const LOCAL_DATA = {data_json};
-  function makeResp(obj) {{
-    return Promise.resolve(new Response(JSON.stringify(obj), {{status: 200, headers: {{'Content-Type': 'application/json'}}}}));
-  }}
-  window.fetch = function(url, opts) {{
-    try {{
-      const u = new URL(url, window.location.origin);
-      if (u.pathname.startsWith('/api/filesystem/list')) {{
-        const p = decodeURIComponent(u.searchParams.get('path') || '');
-        if (LOCAL_DATA.directories[p]) return makeResp(LOCAL_DATA.directories[p]);
-      }}
-      if (u.pathname.startsWith('/api/filesystem/read')) {{
-        const p = decodeURIComponent(u.searchParams.get('path') || '');
-        if (LOCAL_DATA.files[p]) return makeResp(LOCAL_DATA.files[p]);
-      }}
-    }} catch (e) {{}}
-    return Promise.reject(new Error('Offline read-only viewer'));
-  }};
-}})();
-</script>
-"""
-
-            insert_at = base_html.find("<script")
-            if insert_at == -1:
-                final_html = stub_script + base_html
-            else:
-                final_html = base_html[:insert_at] + stub_script + base_html[insert_at:]
-
-            return final_html
+            return _offline_viewer_html(self._path, is_dark(), getattr(self, "_syft_user", None))
 
     def grant_read_access(self, user: str, *, force: bool = False) -> None:
         """Grant read permission to a user."""
@@ -825,40 +886,60 @@ class SyftFile:
             )
 
         # Read all existing permissions for this file
-        access_dict = read_syftpub_yaml(self._path.parent, self._name) or {}
+        existing = read_syftpub_yaml(self._path.parent, self._name)
+        access_dict = existing or {}
 
         # Update the specific permission
-        users = set(access_dict.get(permission, []))
-        users.add(user)
-        access_dict[permission] = format_users(list(users))
+        previous = access_dict.get(permission, [])
+        users = _add_formatted_user(previous, user)
+        if existing is not None and users == previous:
+            return  # Already granted, nothing to write
 
         # Make sure all permission types are present (even if empty)
-        for perm in ["read", "create", "write", "admin"]:
-            if perm not in access_dict:
-                access_dict[perm] = []
+        for perm in _PERMISSION_LEVELS:
+            access_dict.setdefault(perm, [])
+        access_dict[permission] = users
 
         update_syftpub_yaml(self._path.parent, self._name, access_dict)
 
         # Invalidate cache for this path and its parents
         _permission_cache.invalidate(str(self._path))
 
+    def _set_permissions_bulk(self, access_dict: Dict[str, List[str]]) -> None:
+        """Internal method to grant several users and permissions with a single yaml write.
+
+        Users are merged into this file's existing rule, like repeated ``_grant_access``
+        calls would. No datasite validation is done since callers pass permissions
+        that were already in effect elsewhere.
+        """
+        merged = _merge_rule_access(self._path.parent, self._name, access_dict)
+        if merged is None:
+            return  # Nothing to write
+
+        update_syftpub_yaml(self._path.parent, self._name, merged)
+
+        # Invalidate cache for this path and its parents
+        _permission_cache.invalidate(str(self._path))
+
     def _revoke_access(
         self, user: str, permission: Literal["read", "create", "write", "admin"]
     ) -> None:
         """Internal method to revoke permission from a user."""
-        access_dict = read_syftpub_yaml(self._path.parent, self._name) or {}
-        users = set(access_dict.get(permission, []))
+        existing = read_syftpub_yaml(self._path.parent, self._name)
+        access_dict = existing or {}
+        previous = access_dict.get(permission, [])
         # Handle revoking from public access
         if user in ["*", "public"]:
-            users = set()  # Clear all if revoking public
+            users = []  # Clear all if revoking public
         else:
-            users.discard(user)
-        access_dict[permission] = format_users(list(users))
+            users = _remove_formatted_user(previous, user)
+        if existing is not None and users == previous:
+            return  # Nothing to revoke, nothing to write
 
         # Make sure all permission types are present
-        for perm in ["read", "create", "write", "admin"]:
-            if perm not in access_dict:
-                access_dict[perm] = []
+        for perm in _PERMISSION_LEVELS:
+            access_dict.setdefault(perm, [])
+        access_dict[permission] = users
 
         update_syftpub_yaml(self._path.parent, self._name, access_dict)
 
@@ -873,37 +954,10 @@ class SyftFile:
         all_perms = self._get_all_permissions()
 
         # Check if user is the owner using old syftbox logic
-        if _is_owner(str(self._path), user):
+        if _is_owner_in_scope(self._owner_scope, user):
             return True
 
-        # Implement permission hierarchy following old syftbox logic: Admin > Write > Create > Read
-        # Get all permission sets
-        admin_users = all_perms.get("admin", [])
-        write_users = all_perms.get("write", [])
-        create_users = all_perms.get("create", [])
-        read_users = all_perms.get("read", [])
-
-        # Check public access for each level
-        everyone_admin = "*" in admin_users
-        everyone_write = "*" in write_users
-        everyone_create = "*" in create_users
-        everyone_read = "*" in read_users
-
-        # Check user-specific access following old syftbox hierarchy logic
-        is_admin = everyone_admin or user in admin_users
-        is_writer = is_admin or everyone_write or user in write_users
-        is_creator = is_writer or everyone_create or user in create_users
-        is_reader = is_creator or everyone_read or user in read_users
-
-        # Return based on requested permission level
-        if permission == "admin":
-            return is_admin
-        elif permission == "write":
-            return is_writer
-        elif permission == "create":
-            return is_creator
-        elif permission == "read":
-            return is_reader
+        return _has_permission(all_perms, user, permission)
 
     def _get_all_permissions_with_sources(self) -> Dict[str, Any]:
         """Get all permissions using old syftbox nearest-node algorithm with source tracking."""
@@ -925,95 +979,27 @@ class SyftFile:
             parent_dir = current_path.parent
             syftpub_path = parent_dir / "syft.pub.yaml"
 
-            if syftpub_path.exists():
+            parsed = _load_syftpub(syftpub_path)
+            if parsed is not None:
                 try:
-                    with open(syftpub_path, "r") as f:
-                        content = yaml.safe_load(f) or {"rules": []}
+                    sorted_rules, is_terminal = parsed
 
                     # Check if this is a terminal node
-                    if content.get("terminal", False):
+                    if is_terminal:
                         terminal_path = syftpub_path
                         # Terminal nodes stop inheritance and their rules take precedence
-                        rules = content.get("rules", [])
-                        sorted_rules = _sort_rules_by_specificity(rules)
-                        for rule in sorted_rules:
-                            pattern = rule.get("pattern", "")
-                            # Check if pattern matches our file path relative to this directory
-                            rel_path = str(self._path.relative_to(parent_dir))
-                            if _glob_match(pattern, rel_path):
-                                matched_pattern = pattern  # Also track in general matched pattern
-                                access = rule.get("access", {})
-
-                                # Check file limits if present
-                                limits = rule.get("limits", {})
-                                if limits:
-                                    # Check if directories are allowed
-                                    if (
-                                        not limits.get("allow_dirs", True)
-                                        and self._path is not None
-                                        and self._path.is_dir()
-                                    ):
-                                        continue  # Skip this rule for directories
-
-                                    # Check if symlinks are allowed
-                                    if not limits.get("allow_symlinks", True) and self._is_symlink:
-                                        continue  # Skip this rule for symlinks
-
-                                    # Check file size limits
-                                    max_file_size = limits.get("max_file_size")
-                                    if max_file_size is not None:
-                                        if self._size > max_file_size:
-                                            continue  # Skip this rule if file exceeds size limit
-
-                                # Terminal rules override everything - return immediately
-                                for perm in ["read", "create", "write", "admin"]:
-                                    users = format_users(access.get(perm, []))
-                                    effective_perms[perm] = users
-                                    if users:
-                                        source_info[perm] = [
-                                            {
-                                                "path": syftpub_path,
-                                                "pattern": pattern,
-                                                "terminal": True,
-                                                "inherited": False,
-                                            }
-                                        ]
-                                return {
-                                    "permissions": effective_perms,
-                                    "sources": source_info,
-                                    "terminal": terminal_path,
-                                    "terminal_pattern": terminal_pattern,
-                                    "matched_pattern": matched_pattern,
-                                }
-                        # If no match in terminal, stop inheritance with empty permissions
-                        return {
-                            "permissions": effective_perms,
-                            "sources": source_info,
-                            "terminal": terminal_path,
-                            "terminal_pattern": terminal_pattern,
-                            "matched_pattern": matched_pattern,
-                        }
-
-                    # Process rules for non-terminal nodes (sort by specificity first)
-                    rules = content.get("rules", [])
-                    sorted_rules = _sort_rules_by_specificity(rules)
-                    found_matching_rule = False
-                    for rule in sorted_rules:
-                        pattern = rule.get("pattern", "")
                         # Check if pattern matches our file path relative to this directory
-                        rel_path = (
-                            str(self._path.relative_to(parent_dir))
-                            if self._path is not None
-                            else ""
-                        )
-                        if _glob_match(pattern, rel_path):
-                            access = rule.get("access", {})
+                        rel_path = "/".join(self._path_parts[len(parent_dir.parts) :])
+                        for rule in _iter_matching_rules(sorted_rules, rel_path):
+                            pattern = rule.get("pattern", "")
+                            matched_pattern = pattern  # Also track in general matched pattern
+                            permissions = _rule_permissions(rule)
 
                             # Check file limits if present
                             limits = rule.get("limits", {})
                             if limits:
                                 # Check if directories are allowed
-                                if not limits.get("allow_dirs", True) and self._path.is_dir():
+                                if not limits.get("allow_dirs", True) and self._is_dir:
                                     continue  # Skip this rule for directories
 
                                 # Check if symlinks are allowed
@@ -1026,25 +1012,77 @@ class SyftFile:
                                     if self._size > max_file_size:
                                         continue  # Skip this rule if file exceeds size limit
 
-                            # Found a matching rule - this becomes our nearest node
-                            matched_pattern = pattern  # Track the matched pattern
-                            # Use this node's permissions (not accumulate)
-                            for perm in ["read", "create", "write", "admin"]:
-                                users = format_users(access.get(perm, []))
+                            # Terminal rules override everything - return immediately
+                            source = {
+                                "path": syftpub_path,
+                                "pattern": pattern,
+                                "terminal": True,
+                                "inherited": False,
+                            }
+                            for perm in _PERMISSION_LEVELS:
+                                users = permissions[perm]
                                 effective_perms[perm] = users
                                 if users:
-                                    source_info[perm] = [
-                                        {
-                                            "path": syftpub_path,
-                                            "pattern": pattern,
-                                            "terminal": False,
-                                            "inherited": parent_dir != self._path.parent,
-                                        }
-                                    ]
-                            found_matching_rule = True
-                            # Stop at first matching rule
-                            # (rules should be sorted by specificity)
-                            break
+                                    source_info[perm] = [source]
+                            return {
+                                "permissions": effective_perms,
+                                "sources": source_info,
+                                "terminal": terminal_path,
+                                "terminal_pattern": terminal_pattern,
+                                "matched_pattern": matched_pattern,
+                            }
+                        # If no match in terminal, stop inheritance with empty permissions
+                        return {
+                            "permissions": effective_perms,
+                            "sources": source_info,
+                            "terminal": terminal_path,
+                            "terminal_pattern": terminal_pattern,
+                            "matched_pattern": matched_pattern,
+                        }
+
+                    # Process rules for non-terminal nodes (already sorted by specificity)
+                    found_matching_rule = False
+                    # Check if pattern matches our file path relative to this directory
+                    rel_path = "/".join(self._path_parts[len(parent_dir.parts) :])
+                    for rule in _iter_matching_rules(sorted_rules, rel_path):
+                        pattern = rule.get("pattern", "")
+                        permissions = _rule_permissions(rule)
+
+                        # Check file limits if present
+                        limits = rule.get("limits", {})
+                        if limits:
+                            # Check if directories are allowed
+                            if not limits.get("allow_dirs", True) and self._is_dir:
+                                continue  # Skip this rule for directories
+
+                            # Check if symlinks are allowed
+                            if not limits.get("allow_symlinks", True) and self._is_symlink:
+                                continue  # Skip this rule for symlinks
+
+                            # Check file size limits
+                            max_file_size = limits.get("max_file_size")
+                            if max_file_size is not None:
+                                if self._size > max_file_size:
+                                    continue  # Skip this rule if file exceeds size limit
+
+                        # Found a matching rule - this becomes our nearest node
+                        matched_pattern = pattern  # Track the matched pattern
+                        # Use this node's permissions (not accumulate)
+                        source = {
+                            "path": syftpub_path,
+                            "pattern": pattern,
+                            "terminal": False,
+                            "inherited": parent_dir != self._path.parent,
+                        }
+                        for perm in _PERMISSION_LEVELS:
+                            users = permissions[perm]
+                            effective_perms[perm] = users
+                            if users:
+                                source_info[perm] = [source]
+                        found_matching_rule = True
+                        # Stop at first matching rule
+                        # (rules should be sorted by specificity)
+                        break
 
                     # If we found a matching rule, this is our nearest node - stop searching
                     if found_matching_rule:
@@ -1064,119 +1102,35 @@ class SyftFile:
         }
 
     def _check_permission_with_reasons(
-        self, user: str, permission: Literal["read", "create", "write", "admin"]
+        self,
+        user: str,
+        permission: Literal["read", "create", "write", "admin"],
+        perm_data: Optional[Dict[str, Any]] = None,
     ) -> tuple[bool, List[str]]:
-        """Check if a user has a specific permission and return reasons why."""
-        reasons = []
+        """Check if a user has a specific permission and return reasons why.
 
+        Callers checking several users or levels can pass the result of
+        _get_all_permissions_with_sources() as perm_data to walk the tree only once.
+        """
         # Check if user is the owner using old syftbox logic
-        if _is_owner(str(self._path), user):
-            reasons.append("Owner of path")
-            return True, reasons
+        if _is_owner_in_scope(self._owner_scope, user):
+            return True, ["Owner of path"]
 
         # Get all permissions with source tracking
-        perm_data = self._get_all_permissions_with_sources()
-        all_perms = perm_data["permissions"]
-        sources = perm_data["sources"]
-        terminal = perm_data.get("terminal")
-        matched_pattern = perm_data.get("matched_pattern")
-
-        # If blocked by terminal
-        if terminal and not any(all_perms.values()):
-            reasons.append(f"Blocked by terminal at {terminal.parent}")
-            return False, reasons
-
-        # Check hierarchy and build reasons
-        admin_users = all_perms.get("admin", [])
-        write_users = all_perms.get("write", [])
-        create_users = all_perms.get("create", [])
-        read_users = all_perms.get("read", [])
-
-        # Check if user has the permission through hierarchy
-        has_permission = False
-
-        if permission == "admin":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Explicitly granted admin in {src['path'].parent}")
-        elif permission == "write":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Included via admin permission in {src['path'].parent}")
-            elif "*" in write_users or user in write_users:
-                has_permission = True
-                if sources.get("write"):
-                    src = sources["write"][0]
-                    reasons.append(f"Explicitly granted write in {src['path'].parent}")
-        elif permission == "create":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Included via admin permission in {src['path'].parent}")
-            elif "*" in write_users or user in write_users:
-                has_permission = True
-                if sources.get("write"):
-                    src = sources["write"][0]
-                    reasons.append(f"Included via write permission in {src['path'].parent}")
-            elif "*" in create_users or user in create_users:
-                has_permission = True
-                if sources.get("create"):
-                    src = sources["create"][0]
-                    reasons.append(f"Explicitly granted create in {src['path'].parent}")
-        elif permission == "read":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Included via admin permission in {src['path'].parent}")
-            elif "*" in write_users or user in write_users:
-                has_permission = True
-                if sources.get("write"):
-                    src = sources["write"][0]
-                    reasons.append(f"Included via write permission in {src['path'].parent}")
-            elif "*" in create_users or user in create_users:
-                has_permission = True
-                if sources.get("create"):
-                    src = sources["create"][0]
-                    reasons.append(f"Included via create permission in {src['path'].parent}")
-            elif "*" in read_users or user in read_users:
-                has_permission = True
-                if sources.get("read"):
-                    src = sources["read"][0]
-                    reasons.append(f"Explicitly granted read in {src['path'].parent}")
-
-        # Add pattern info only for the specific permission being checked
-        # (not for inherited permissions - that would be confusing)
-        if sources.get(permission):
-            for src in sources[permission]:
-                if src["pattern"]:
-                    # Show the pattern that was matched for this specific permission
-                    if f"Pattern '{src['pattern']}' matched" not in reasons:
-                        reasons.append(f"Pattern '{src['pattern']}' matched")
-                    break
-
-        # If we don't have permission but a pattern was matched (terminal or non-terminal),
-        # it means the rule was evaluated but didn't grant this permission
-        elif matched_pattern and not has_permission:
-            if f"Pattern '{matched_pattern}' matched" not in reasons:
-                reasons.append(f"Pattern '{matched_pattern}' matched")
+        if perm_data is None:
+            perm_data = self._get_all_permissions_with_sources()
+        return _explain_permission(perm_data, user, permission)
 
-        # Check for public access
-        if "*" in all_perms.get(permission, []) or (
-            has_permission and "*" in [admin_users, write_users, create_users, read_users]
-        ):
-            if "Public access (*)" not in reasons:
-                reasons.append("Public access (*)")
-
-        if not has_permission and not reasons:
-            reasons.append("No permission found")
+    def _check_all_permissions_with_reasons(
+        self, user: str, perm_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, tuple[bool, List[str]]]:
+        """Check every permission level for a user at once, returning (has, reasons) per level."""
+        if _is_owner_in_scope(self._owner_scope, user):
+            return {level: (True, ["Owner of path"]) for level in _PERMISSION_LEVELS}
 
-        return has_permission, reasons
+        if perm_data is None:
+            perm_data = self._get_all_permissions_with_sources()
+        return {level: _explain_permission(perm_data, user, level) for level in _PERMISSION_LEVELS}
 
     def explain_permissions(self, user: Union[str, None] = None) -> PermissionExplanation:
         """Provide detailed explanation of why user has/lacks permissions.
@@ -1190,10 +1144,11 @@ class SyftFile:
         result = PermissionExplanation(str(self._path), user)
 
         if user is not None:
-            # Single user analysis
+            # Single user analysis, walking the hierarchy once for all four levels
+            results = self._check_all_permissions_with_reasons(user)
             permissions_data = {}
             for perm in ["admin", "write", "create", "read"]:
-                has_perm, reasons = self._check_permission_with_reasons(user, perm)  # type: ignore
+                has_perm, reasons = results[perm]
                 permissions_data[perm] = {"granted": has_perm, "reasons": reasons}
 
             result.add_user_explanation(user, permissions_data)
@@ -1201,17 +1156,22 @@ class SyftFile:
             # All users analysis
             # Get all permissions and collect unique users
             all_perms = self._get_all_permissions()
-            all_users = set()
-            for perm_level in all_perms.values():
-                all_users.update(perm_level)
+            all_users = set().union(*all_perms.values())
 
             # Sort users for consistent output
             sorted_users = sorted(all_users)
 
+            # Every user is explained against the same sources
+            perm_data = (
+                _with_user_sets(self._get_all_permissions_with_sources()) if sorted_users else None
+            )
+
             for current_user in sorted_users:
+                # Ownership is checked once per user, covering all four levels
+                results = self._check_all_permissions_with_reasons(current_user, perm_data)
                 permissions_data = {}
                 for perm in ["admin", "write", "create", "read"]:
-                    has_perm, reasons = self._check_permission_with_reasons(current_user, perm)  # type: ignore
+                    has_perm, reasons = results[perm]
                     permissions_data[perm] = {"granted": has_perm, "reasons": reasons}
 
                 result.add_user_explanation(current_user, permissions_data)
@@ -1249,19 +1209,17 @@ class SyftFile:
         perms = self._get_all_permissions()
 
         # Create parent directory if needed
-        new_path.parent.mkdir(parents=True, exist_ok=True)
+        if not new_path.parent.is_dir():
+            new_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Move the file
-        shutil.move(str(self._path), str(new_path))
+        _move_path(self._path, new_path)
 
         # Create new SyftFile instance
         new_file = SyftFile(new_path)
 
         # Apply permissions to new location
-        for permission, users in perms.items():
-            for user in users:
-                if permission in ["read", "create", "write", "admin"]:
-                    new_file._grant_access(user, permission)  # type: ignore[arg-type]
+        new_file._set_permissions_bulk(perms)
 
         return new_file
 
@@ -1302,6 +1260,21 @@ class SyftFolder:
         """Get the folder name"""
         return self._path.name
 
+    @cached_property
+    def _owner_scope(self) -> Tuple[Optional[str], FrozenSet[str]]:
+        """Path-derived data used to check ownership, resolved once per instance."""
+        return _resolve_owner_scope(str(self._path))
+
+    @cached_property
+    def _datasite_owner(self) -> Optional[str]:
+        """Owner of the datasite containing this path, resolved once per instance."""
+        return _resolve_datasite_owner(str(self._path))
+
+    @cached_property
+    def _path_parts(self) -> Tuple[str, ...]:
+        """Components of the path, used to slice out paths relative to ancestors."""
+        return self._path.parts
+
     @property
     def _permissions_dict(self) -> Dict[str, List[str]]:
         """Get all permissions for this folder as a dictionary."""
@@ -1315,7 +1288,7 @@ class SyftFolder:
 
         try:
             with open(syftpub_path, "r") as f:
-                content = yaml.safe_load(f) or {}
+                content = yaml.load(f, Loader=_YamlLoader) or {}
             return content.get("terminal", False)
         except Exception:
             return False
@@ -1329,10 +1302,14 @@ class SyftFolder:
         if syftpub_path.exists():
             try:
                 with open(syftpub_path, "r") as f:
-                    content = yaml.safe_load(f) or {"rules": []}
+                    content = yaml.load(f, Loader=_YamlLoader) or {"rules": []}
             except Exception:
                 content = {"rules": []}
 
+            # Nothing changed - keep the file and the cache as they are
+            if "terminal" in content and content["terminal"] == value:
+                return
+
         # Set terminal value
         content["terminal"] = value
 
@@ -1340,8 +1317,7 @@ class SyftFolder:
         syftpub_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write back to file
-        with open(syftpub_path, "w") as f:
-            yaml.dump(content, f, default_flow_style=False, sort_keys=False)
+        _atomic_write_yaml(syftpub_path, content)
 
         # Clear cache since we modified the file
         _permission_cache.invalidate(str(self._path))
@@ -1364,34 +1340,25 @@ class SyftFolder:
 
         # First check if this folder has its own syft.pub.yaml file
         syftpub_path = self._path / "syft.pub.yaml"
-        if syftpub_path.exists():
+        parsed = _load_syftpub(syftpub_path)
+        if parsed is not None:
             try:
-                with open(syftpub_path, "r") as f:
-                    content = yaml.safe_load(f) or {"rules": []}
-
-                # Process rules from the folder's own yaml file
-                rules = content.get("rules", [])
-                sorted_rules = _sort_rules_by_specificity(rules)
-                for rule in sorted_rules:
-                    pattern = rule.get("pattern", "")
-                    # For the folder's own permissions, we look for "**" pattern
-                    # which means permissions for the folder itself
-                    if pattern == "**":
-                        access = rule.get("access", {})
-                        # Check file limits if present
-                        limits = rule.get("limits", {})
-                        if limits:
-                            # Check if directories are allowed
-                            if not limits.get("allow_dirs", True):
-                                continue  # Skip this rule for directories
+                sorted_rules, _ = parsed
+
+                # For the folder's own permissions, we look for "**" rules
+                # which mean permissions for the folder itself
+                for rule in sorted_rules.by_pattern.get("**", ()):
+                    # Check file limits if present
+                    limits = rule.get("limits", {})
+                    if limits:
+                        # Check if directories are allowed
+                        if not limits.get("allow_dirs", True):
+                            continue  # Skip this rule for directories
 
-                        # Use this rule's permissions
-                        folder_permissions = {
-                            perm: format_users(access.get(perm, []))
-                            for perm in ["read", "create", "write", "admin"]
-                        }
-                        # Stop at first matching rule (sorted by specificity)
-                        break
+                    # Use this rule's permissions
+                    folder_permissions = _rule_permissions(rule)
+                    # Stop at first matching rule (sorted by specificity)
+                    break
 
             except Exception:
                 pass
@@ -1404,55 +1371,18 @@ class SyftFolder:
                 parent_dir = current_path.parent
                 syftpub_path = parent_dir / "syft.pub.yaml"
 
-                if syftpub_path.exists():
+                parsed = _load_syftpub(syftpub_path)
+                if parsed is not None:
                     try:
-                        with open(syftpub_path, "r") as f:
-                            content = yaml.safe_load(f) or {"rules": []}
+                        sorted_rules, is_terminal = parsed
 
                         # Check if this is a terminal node
-                        if content.get("terminal", False):
+                        if is_terminal:
                             # Terminal nodes stop inheritance and their rules take precedence
-                            rules = content.get("rules", [])
-                            sorted_rules = _sort_rules_by_specificity(rules)
-                            for rule in sorted_rules:
-                                pattern = rule.get("pattern", "")
-                                # Check if pattern matches our folder path
-                                # relative to this directory
-                                rel_path = str(self._path.relative_to(parent_dir))
-                                if _glob_match(pattern, rel_path) or _glob_match(
-                                    pattern, rel_path + "/"
-                                ):
-                                    access = rule.get("access", {})
-                                    # Check file limits if present
-                                    limits = rule.get("limits", {})
-                                    if limits:
-                                        # Check if directories are allowed
-                                        if not limits.get("allow_dirs", True):
-                                            continue  # Skip this rule for directories
-
-                                    # Terminal rules override everything - return immediately
-                                    result = {
-                                        perm: format_users(access.get(perm, []))
-                                        for perm in ["read", "create", "write", "admin"]
-                                    }
-                                    _permission_cache.set(cache_key, result)
-                                    return result
-                            # If no match in terminal, stop inheritance with empty permissions
-                            _permission_cache.set(cache_key, folder_permissions)
-                            return folder_permissions
-
-                        # Process rules for non-terminal nodes (sort by specificity first)
-                        rules = content.get("rules", [])
-                        sorted_rules = _sort_rules_by_specificity(rules)
-                        found_matching_rule = False
-                        for rule in sorted_rules:
-                            pattern = rule.get("pattern", "")
-                            # Check if pattern matches our folder path relative to this directory
-                            rel_path = str(self._path.relative_to(parent_dir))
-                            if _glob_match(pattern, rel_path) or _glob_match(
-                                pattern, rel_path + "/"
-                            ):
-                                access = rule.get("access", {})
+                            # Check if pattern matches our folder path
+                            # relative to this directory
+                            rel_path = "/".join(self._path_parts[len(parent_dir.parts) :])
+                            for rule in _iter_matching_rules(sorted_rules, rel_path):
                                 # Check file limits if present
                                 limits = rule.get("limits", {})
                                 if limits:
@@ -1460,16 +1390,33 @@ class SyftFolder:
                                     if not limits.get("allow_dirs", True):
                                         continue  # Skip this rule for directories
 
-                                # Found a matching rule - this becomes our nearest node
-                                # Use this node's permissions (not accumulate)
-                                folder_permissions = {
-                                    perm: format_users(access.get(perm, []))
-                                    for perm in ["read", "create", "write", "admin"]
-                                }
-                                found_matching_rule = True
-                                # Stop at first matching rule
-                                # (rules should be sorted by specificity)
-                                break
+                                # Terminal rules override everything - return immediately
+                                result = _rule_permissions(rule)
+                                _permission_cache.set(cache_key, result)
+                                return result
+                            # If no match in terminal, stop inheritance with empty permissions
+                            _permission_cache.set(cache_key, folder_permissions)
+                            return folder_permissions
+
+                        # Process rules for non-terminal nodes (already sorted by specificity)
+                        found_matching_rule = False
+                        # Check if pattern matches our folder path relative to this directory
+                        rel_path = "/".join(self._path_parts[len(parent_dir.parts) :])
+                        for rule in _iter_matching_rules(sorted_rules, rel_path):
+                            # Check file limits if present
+                            limits = rule.get("limits", {})
+                            if limits:
+                                # Check if directories are allowed
+                                if not limits.get("allow_dirs", True):
+                                    continue  # Skip this rule for directories
+
+                            # Found a matching rule - this becomes our nearest node
+                            # Use this node's permissions (not accumulate)
+                            folder_permissions = _rule_permissions(rule)
+                            found_matching_rule = True
+                            # Stop at first matching rule
+                            # (rules should be sorted by specificity)
+                            break
 
                         # If we found a matching rule, this is our nearest node - stop searching
                         if found_matching_rule:
@@ -1481,19 +1428,12 @@ class SyftFolder:
                 current_path = parent_dir
 
         # Add owner permissions: datasite owner gets full admin access
-        path_str = str(self._path)
-        if "datasites" in path_str:
-            # Extract datasite owner from path like: /path/to/SyftBox/datasites/user@domain.com/...
-            parts = path_str.split("datasites")
-            if len(parts) > 1:
-                datasites_relative = parts[-1].lstrip("/\\")
-                path_segments = datasites_relative.split("/")
-                if path_segments and "@" in path_segments[0]:
-                    datasite_owner = path_segments[0]
-                    # Grant full permissions to datasite owner
-                    for perm_type in ["read", "create", "write", "admin"]:
-                        if datasite_owner not in folder_permissions[perm_type]:
-                            folder_permissions[perm_type].append(datasite_owner)
+        datasite_owner = self._datasite_owner
+        if datasite_owner is not None:
+            # Grant full permissions to datasite owner
+            for perm_type in _PERMISSION_LEVELS:
+                if datasite_owner not in folder_permissions[perm_type]:
+                    folder_permissions[perm_type].append(datasite_owner)
 
         # Cache and return the effective permissions
         _permission_cache.set(cache_key, folder_permissions)
@@ -1506,179 +1446,27 @@ class SyftFolder:
         """
         perms = self._get_all_permissions()
 
-        # Get all unique users
-        all_users = set()
-        for users in perms.values():
-            all_users.update(users)
+        # Get all unique users, handling public separately
+        all_users = set().union(*perms.values())
+
+        # Every user and level below is explained against the same sources
+        perm_data = _with_user_sets(self._get_all_permissions_with_sources()) if all_users else None
+
+        has_public = "*" in all_users
+        all_users.discard("*")
 
         # Create table rows
         rows = []
 
         # First add public if it exists
-        if "*" in all_users:
-            # Collect all reasons for public
-
-            # Check each permission level and collect reasons
-            read_has, read_reasons = self._check_permission_with_reasons("*", "read")
-            create_has, create_reasons = self._check_permission_with_reasons("*", "create")
-            write_has, write_reasons = self._check_permission_with_reasons("*", "write")
-            admin_has, admin_reasons = self._check_permission_with_reasons("*", "admin")
-
-            # Collect reasons with permission level prefixes
-            permission_reasons = []
-
-            # Collect all reasons with their permission levels
-            if admin_has:
-                for reason in admin_reasons:
-                    permission_reasons.append(f"[Admin] {reason}")
-
-            if write_has:
-                for reason in write_reasons:
-                    # Skip if this is just hierarchy from admin
-                    if "Included via admin permission" not in reason:
-                        permission_reasons.append(f"[Write] {reason}")
-
-            if create_has:
-                for reason in create_reasons:
-                    # Skip if this is just hierarchy from write/admin
-                    if (
-                        "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Create] {reason}")
-
-            if read_has:
-                for reason in read_reasons:
-                    # Skip if this is just hierarchy from create/write/admin
-                    if (
-                        "Included via create permission" not in reason
-                        and "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Read] {reason}")
-
-            # Format reasons for display
-            if not permission_reasons and not any([read_has, create_has, write_has, admin_has]):
-                reason_text = "No permissions found"
-            else:
-                # Smart deduplication: consolidate pattern matches across permission levels
-                unique_reasons = []
-                seen_patterns = set()
-                seen_other = set()
-
-                for reason in permission_reasons:
-                    # Extract pattern from reason if it contains "Pattern"
-                    if "Pattern '" in reason and "matched" in reason:
-                        # Extract just the pattern part
-                        pattern_start = reason.find("Pattern '") + 9
-                        pattern_end = reason.find("' matched", pattern_start)
-                        if pattern_end > pattern_start:
-                            pattern = reason[pattern_start:pattern_end]
-                            if pattern not in seen_patterns:
-                                seen_patterns.add(pattern)
-                                # Add pattern match without permission level prefix
-                                unique_reasons.append(f"Pattern '{pattern}' matched")
-                    else:
-                        # For non-pattern reasons, keep the permission-level prefix
-                        if reason not in seen_other:
-                            seen_other.add(reason)
-                            unique_reasons.append(reason)
-
-                reason_text = "; ".join(unique_reasons)
-
-            rows.append(
-                [
-                    "public",
-                    "✓" if read_has else "",
-                    "✓" if create_has else "",
-                    "✓" if write_has else "",
-                    "✓" if admin_has else "",
-                    reason_text,
-                ]
-            )
-            all_users.remove("*")  # Remove so we don't process it again
+        if has_public:
+            results = self._check_all_permissions_with_reasons("*", perm_data)
+            rows.append(_permission_table_row("public", results))
 
         # Then add all other users
         for user in sorted(all_users):
-            # Collect all reasons for this user
-
-            # Check each permission level and collect reasons
-            read_has, read_reasons = self._check_permission_with_reasons(user, "read")
-            create_has, create_reasons = self._check_permission_with_reasons(user, "create")
-            write_has, write_reasons = self._check_permission_with_reasons(user, "write")
-            admin_has, admin_reasons = self._check_permission_with_reasons(user, "admin")
-
-            # Collect reasons with permission level prefixes
-            permission_reasons = []
-
-            # Collect all reasons with their permission levels
-            if admin_has:
-                for reason in admin_reasons:
-                    permission_reasons.append(f"[Admin] {reason}")
-
-            if write_has:
-                for reason in write_reasons:
-                    # Skip if this is just hierarchy from admin
-                    if "Included via admin permission" not in reason:
-                        permission_reasons.append(f"[Write] {reason}")
-
-            if create_has:
-                for reason in create_reasons:
-                    # Skip if this is just hierarchy from write/admin
-                    if (
-                        "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Create] {reason}")
-
-            if read_has:
-                for reason in read_reasons:
-                    # Skip if this is just hierarchy from create/write/admin
-                    if (
-                        "Included via create permission" not in reason
-                        and "Included via write permission" not in reason
-                        and "Included via admin permission" not in reason
-                    ):
-                        permission_reasons.append(f"[Read] {reason}")
-
-            # Format reasons for display
-            if not permission_reasons and not any([read_has, create_has, write_has, admin_has]):
-                reason_text = "No permissions found"
-            else:
-                # Smart deduplication: consolidate pattern matches across permission levels
-                unique_reasons = []
-                seen_patterns = set()
-                seen_other = set()
-
-                for reason in permission_reasons:
-                    # Extract pattern from reason if it contains "Pattern"
-                    if "Pattern '" in reason and "matched" in reason:
-                        # Extract just the pattern part
-                        pattern_start = reason.find("Pattern '") + 9
-                        pattern_end = reason.find("' matched", pattern_start)
-                        if pattern_end > pattern_start:
-                            pattern = reason[pattern_start:pattern_end]
-                            if pattern not in seen_patterns:
-                                seen_patterns.add(pattern)
-                                # Add pattern match without permission level prefix
-                                unique_reasons.append(f"Pattern '{pattern}' matched")
-                    else:
-                        # For non-pattern reasons, keep the permission-level prefix
-                        if reason not in seen_other:
-                            seen_other.add(reason)
-                            unique_reasons.append(reason)
-
-                reason_text = "; ".join(unique_reasons)
-
-            row = [
-                user,
-                "✓" if read_has else "",
-                "✓" if create_has else "",
-                "✓" if write_has else "",
-                "✓" if admin_has else "",
-                reason_text,
-            ]
-            rows.append(row)
+            results = self._check_all_permissions_with_reasons(user, perm_data)
+            rows.append(_permission_table_row(user, results))
 
         return rows
 
@@ -1688,16 +1476,14 @@ class SyftFolder:
         if not rows:
             return f"SyftFolder('{self._path}') - No permissions set"
 
-        try:
-            from tabulate import tabulate
-
-            table = tabulate(
+        if _tabulate is not None:
+            table = _tabulate(
                 rows,
                 headers=["User", "Read", "Create", "Write", "Admin", "Reason"],
                 tablefmt="simple",
             )
             return f"SyftFolder('{self._path}')\n\n{table}"
-        except ImportError:
+        else:
             # Fallback to simple table format if tabulate not available
             result = [f"SyftFolder('{self._path}')\n"]
             result.append("User               Read  Create  Write  Admin  Reason")
@@ -1867,125 +1653,7 @@ class SyftFolder:
             # -----------------------------
             # Offline fallback (read-only)
             # -----------------------------
-            import html as _html
-            import json as _json
-            import uuid as _uuid
-            from pathlib import Path as _Path
-
-            from .filesystem_editor import generate_editor_html as _gen_html
-
-            is_dark_mode = is_dark()
-            # (no external import needed)
-
-            # Build static data for the in-browser stubbed API
-            root_dir = _Path(self._path).parent
-
-            def _build_local_data(start_path: _Path):
-                directories: dict = {}
-                files: dict = {}
-
-                def _recurse(dir_path: _Path):
-                    try:
-                        items = []
-                        for child in sorted(
-                            dir_path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower())
-                        ):
-                            try:
-                                stat = child.stat()
-                                # Format modified date as ISO string like the server-backed API
-                                modified_iso = datetime.fromtimestamp(stat.st_mtime).isoformat()
-                                item_info = {
-                                    "name": child.name,
-                                    "path": str(child),
-                                    "is_directory": child.is_dir(),
-                                    "size": None if child.is_dir() else stat.st_size,
-                                    "modified": modified_iso,
-                                    "is_editable": False,  # read-only fallback
-                                    "extension": (
-                                        child.suffix.lower() if not child.is_dir() else None
-                                    ),
-                                }
-                            except Exception:
-                                continue
-                            items.append(item_info)
-
-                            if child.is_dir():
-                                _recurse(child)
-                            else:
-                                try:
-                                    with open(child, "r", encoding="utf-8", errors="replace") as f:
-                                        content = f.read()
-                                except Exception:
-                                    content = ""
-                                if len(content) > 20000:
-                                    content = content[:20000] + "\n\n… (truncated)"
-                                files[str(child)] = {
-                                    "path": str(child),
-                                    "content": content,
-                                    "size": stat.st_size,
-                                    "modified": modified_iso,
-                                    "extension": child.suffix.lower(),
-                                    "encoding": "utf-8",
-                                    "can_write": False,
-                                    "can_admin": False,
-                                    "write_users": [],
-                                }
-                        directories[str(dir_path)] = {
-                            "path": str(dir_path),
-                            "parent": str(dir_path.parent) if dir_path.parent != dir_path else None,
-                            "items": items,
-                            "total_items": len(items),
-                            "can_admin": False,
-                        }
-                    except Exception:
-                        pass
-
-                _recurse(start_path)
-                return {"directories": directories, "files": files}
-
-            local_data = _build_local_data(root_dir)
-            data_json = _json.dumps(local_data)
-
-            # Base HTML from the editor (we'll stub out its network calls)
-            base_html = _gen_html(
-                initial_path=str(self._path),
-                is_dark_mode=is_dark_mode,
-                syft_user=getattr(self, "_syft_user", None),
-            )
-
-            # JavaScript stub to override fetch with local data
-            stub_script = f"""
-<script>
-(function() {{
-  const LOCAL_DATA = {data_json};
-  function makeResp(obj) {{
-    return Promise.resolve(new Response(JSON.stringify(obj), {{status: 200, headers: {{'Content-Type': 'application/json'}}}}));
-  }}
-  window.fetch = function(url, opts) {{
-    try {{
-      const u = new URL(url, window.location.origin);
-      if (u.pathname.startsWith('/api/filesystem/list')) {{
-        const p = decodeURIComponent(u.searchParams.get('path') || '');
-        if (LOCAL_DATA.directories[p]) return makeResp(LOCAL_DATA.directories[p]);
-      }}
-      if (u.pathname.startsWith('/api/filesystem/read')) {{
-        const p = decodeURIComponent(u.searchParams.get('path') || '');
-        if (LOCAL_DATA.files[p]) return makeResp(LOCAL_DATA.files[p]);
-      }}
-    }} catch (e) {{}}
-    return Promise.reject(new Error('Offline read-only viewer'));
-  }};
-}})();
-</script>
-"""
-
-            insert_at = base_html.find("<script")
-            if insert_at == -1:
-                final_html = stub_script + base_html
-            else:
-                final_html = base_html[:insert_at] + stub_script + base_html[insert_at:]
-
-            return final_html
+            return _offline_viewer_html(self._path, is_dark(), getattr(self, "_syft_user", None))
 
     def grant_read_access(self, user: str, *, force: bool = False) -> None:
         """Grant read permission to a user."""
@@ -2063,40 +1731,60 @@ class SyftFolder:
             )
 
         # Read all existing permissions for this folder
-        access_dict = read_syftpub_yaml(self._path, "**") or {}
+        existing = read_syftpub_yaml(self._path, "**")
+        access_dict = existing or {}
 
         # Update the specific permission
-        users = set(access_dict.get(permission, []))
-        users.add(user)
-        access_dict[permission] = format_users(list(users))
+        previous = access_dict.get(permission, [])
+        users = _add_formatted_user(previous, user)
+        if existing is not None and users == previous:
+            return  # Already granted, nothing to write
 
         # Make sure all permission types are present (even if empty)
-        for perm in ["read", "create", "write", "admin"]:
-            if perm not in access_dict:
-                access_dict[perm] = []
+        for perm in _PERMISSION_LEVELS:
+            access_dict.setdefault(perm, [])
+        access_dict[permission] = users
 
         update_syftpub_yaml(self._path, "**", access_dict)
 
         # Invalidate cache for this path and its children
         _permission_cache.invalidate(str(self._path))
 
+    def _set_permissions_bulk(self, access_dict: Dict[str, List[str]]) -> None:
+        """Internal method to grant several users and permissions with a single yaml write.
+
+        Users are merged into this folder's existing ``**`` rule, like repeated
+        ``_grant_access`` calls would. No datasite validation is done since callers
+        pass permissions that were already in effect elsewhere.
+        """
+        merged = _merge_rule_access(self._path, "**", access_dict)
+        if merged is None:
+            return  # Nothing to write
+
+        update_syftpub_yaml(self._path, "**", merged)
+
+        # Invalidate cache for this path and its children
+        _permission_cache.invalidate(str(self._path))
+
     def _revoke_access(
         self, user: str, permission: Literal["read", "create", "write", "admin"]
     ) -> None:
         """Internal method to revoke permission from a user."""
-        access_dict = read_syftpub_yaml(self._path, "**") or {}
-        users = set(access_dict.get(permission, []))
+        existing = read_syftpub_yaml(self._path, "**")
+        access_dict = existing or {}
+        previous = access_dict.get(permission, [])
         # Handle revoking from public access
         if user in ["*", "public"]:
-            users = set()  # Clear all if revoking public
+            users = []  # Clear all if revoking public
         else:
-            users.discard(user)
-        access_dict[permission] = format_users(list(users))
+            users = _remove_formatted_user(previous, user)
+        if existing is not None and users == previous:
+            return  # Nothing to revoke, nothing to write
 
         # Make sure all permission types are present
-        for perm in ["read", "create", "write", "admin"]:
-            if perm not in access_dict:
-                access_dict[perm] = []
+        for perm in _PERMISSION_LEVELS:
+            access_dict.setdefault(perm, [])
+        access_dict[permission] = users
 
         update_syftpub_yaml(self._path, "**", access_dict)
 
@@ -2111,152 +1799,41 @@ class SyftFolder:
         all_perms = self._get_all_permissions()
 
         # Check if user is the owner using old syftbox logic
-        if _is_owner(str(self._path), user):
+        if _is_owner_in_scope(self._owner_scope, user):
             return True
 
-        # Implement permission hierarchy following old syftbox logic: Admin > Write > Create > Read
-        # Get all permission sets
-        admin_users = all_perms.get("admin", [])
-        write_users = all_perms.get("write", [])
-        create_users = all_perms.get("create", [])
-        read_users = all_perms.get("read", [])
-
-        # Check public access for each level
-        everyone_admin = "*" in admin_users
-        everyone_write = "*" in write_users
-        everyone_create = "*" in create_users
-        everyone_read = "*" in read_users
-
-        # Check user-specific access following old syftbox hierarchy logic
-        is_admin = everyone_admin or user in admin_users
-        is_writer = is_admin or everyone_write or user in write_users
-        is_creator = is_writer or everyone_create or user in create_users
-        is_reader = is_creator or everyone_read or user in read_users
-
-        # Return based on requested permission level
-        if permission == "admin":
-            return is_admin
-        elif permission == "write":
-            return is_writer
-        elif permission == "create":
-            return is_creator
-        elif permission == "read":
-            return is_reader
+        return _has_permission(all_perms, user, permission)
 
     def _check_permission_with_reasons(
-        self, user: str, permission: Literal["read", "create", "write", "admin"]
+        self,
+        user: str,
+        permission: Literal["read", "create", "write", "admin"],
+        perm_data: Optional[Dict[str, Any]] = None,
     ) -> tuple[bool, List[str]]:
-        """Check if a user has a specific permission and return reasons why."""
-        reasons = []
+        """Check if a user has a specific permission and return reasons why.
 
+        Callers checking several users or levels can pass the result of
+        _get_all_permissions_with_sources() as perm_data to walk the tree only once.
+        """
         # Check if user is the owner using old syftbox logic
-        if _is_owner(str(self._path), user):
-            reasons.append("Owner of path")
-            return True, reasons
+        if _is_owner_in_scope(self._owner_scope, user):
+            return True, ["Owner of path"]
 
         # Get all permissions with source tracking
-        perm_data = self._get_all_permissions_with_sources()
-        all_perms = perm_data["permissions"]
-        sources = perm_data["sources"]
-        terminal = perm_data.get("terminal")
-        matched_pattern = perm_data.get("matched_pattern")
-
-        # If blocked by terminal
-        if terminal and not any(all_perms.values()):
-            reasons.append(f"Blocked by terminal at {terminal.parent}")
-            return False, reasons
-
-        # Check hierarchy and build reasons
-        admin_users = all_perms.get("admin", [])
-        write_users = all_perms.get("write", [])
-        create_users = all_perms.get("create", [])
-        read_users = all_perms.get("read", [])
-
-        # Check if user has the permission through hierarchy
-        has_permission = False
-
-        if permission == "admin":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Explicitly granted admin in {src['path'].parent}")
-        elif permission == "write":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Included via admin permission in {src['path'].parent}")
-            elif "*" in write_users or user in write_users:
-                has_permission = True
-                if sources.get("write"):
-                    src = sources["write"][0]
-                    reasons.append(f"Explicitly granted write in {src['path'].parent}")
-        elif permission == "create":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Included via admin permission in {src['path'].parent}")
-            elif "*" in write_users or user in write_users:
-                has_permission = True
-                if sources.get("write"):
-                    src = sources["write"][0]
-                    reasons.append(f"Included via write permission in {src['path'].parent}")
-            elif "*" in create_users or user in create_users:
-                has_permission = True
-                if sources.get("create"):
-                    src = sources["create"][0]
-                    reasons.append(f"Explicitly granted create in {src['path'].parent}")
-        elif permission == "read":
-            if "*" in admin_users or user in admin_users:
-                has_permission = True
-                if sources.get("admin"):
-                    src = sources["admin"][0]
-                    reasons.append(f"Included via admin permission in {src['path'].parent}")
-            elif "*" in write_users or user in write_users:
-                has_permission = True
-                if sources.get("write"):
-                    src = sources["write"][0]
-                    reasons.append(f"Included via write permission in {src['path'].parent}")
-            elif "*" in create_users or user in create_users:
-                has_permission = True
-                if sources.get("create"):
-                    src = sources["create"][0]
-                    reasons.append(f"Included via create permission in {src['path'].parent}")
-            elif "*" in read_users or user in read_users:
-                has_permission = True
-                if sources.get("read"):
-                    src = sources["read"][0]
-                    reasons.append(f"Explicitly granted read in {src['path'].parent}")
-
-        # Add pattern info only for the specific permission being checked
-        # (not for inherited permissions - that would be confusing)
-        if sources.get(permission):
-            for src in sources[permission]:
-                if src["pattern"]:
-                    # Show the pattern that was matched for this specific permission
-                    if f"Pattern '{src['pattern']}' matched" not in reasons:
-                        reasons.append(f"Pattern '{src['pattern']}' matched")
-                    break
-
-        # If we don't have permission but a pattern was matched (terminal or non-terminal),
-        # it means the rule was evaluated but didn't grant this permission
-        elif matched_pattern and not has_permission:
-            if f"Pattern '{matched_pattern}' matched" not in reasons:
-                reasons.append(f"Pattern '{matched_pattern}' matched")
-
-        # Check for public access
-        if "*" in all_perms.get(permission, []) or (
-            has_permission and "*" in [admin_users, write_users, create_users, read_users]
-        ):
-            if "Public access (*)" not in reasons:
-                reasons.append("Public access (*)")
+        if perm_data is None:
+            perm_data = self._get_all_permissions_with_sources()
+        return _explain_permission(perm_data, user, permission)
 
-        if not has_permission and not reasons:
-            reasons.append("No permission found")
+    def _check_all_permissions_with_reasons(
+        self, user: str, perm_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, tuple[bool, List[str]]]:
+        """Check every permission level for a user at once, returning (has, reasons) per level."""
+        if _is_owner_in_scope(self._owner_scope, user):
+            return {level: (True, ["Owner of path"]) for level in _PERMISSION_LEVELS}
 
-        return has_permission, reasons
+        if perm_data is None:
+            perm_data = self._get_all_permissions_with_sources()
+        return {level: _explain_permission(perm_data, user, level) for level in _PERMISSION_LEVELS}
 
     def explain_permissions(self, user: Union[str, None] = None) -> PermissionExplanation:
         """Provide detailed explanation of why user has/lacks permissions.
@@ -2270,10 +1847,11 @@ class SyftFolder:
         result = PermissionExplanation(str(self._path), user)
 
         if user is not None:
-            # Single user analysis
+            # Single user analysis, walking the hierarchy once for all four levels
+            results = self._check_all_permissions_with_reasons(user)
             permissions_data = {}
             for perm in ["admin", "write", "create", "read"]:
-                has_perm, reasons = self._check_permission_with_reasons(user, perm)  # type: ignore
+                has_perm, reasons = results[perm]
                 permissions_data[perm] = {"granted": has_perm, "reasons": reasons}
 
             result.add_user_explanation(user, permissions_data)
@@ -2281,17 +1859,22 @@ class SyftFolder:
             # All users analysis
             # Get all permissions and collect unique users
             all_perms = self._get_all_permissions()
-            all_users = set()
-            for perm_level in all_perms.values():
-                all_users.update(perm_level)
+            all_users = set().union(*all_perms.values())
 
             # Sort users for consistent output
             sorted_users = sorted(all_users)
 
+            # Every user is explained against the same sources
+            perm_data = (
+                _with_user_sets(self._get_all_permissions_with_sources()) if sorted_users else None
+            )
+
             for current_user in sorted_users:
+                # Ownership is checked once per user, covering all four levels
+                results = self._check_all_permissions_with_reasons(current_user, perm_data)
                 permissions_data = {}
                 for perm in ["admin", "write", "create", "read"]:
-                    has_perm, reasons = self._check_permission_with_reasons(current_user, perm)  # type: ignore
+                    has_perm, reasons = results[perm]
                     permissions_data[perm] = {"granted": has_perm, "reasons": reasons}
 
                 result.add_user_explanation(current_user, permissions_data)
@@ -2328,8 +1911,9 @@ class SyftFolder:
         if new_path.exists():
             raise FileExistsError(f"Destination folder already exists: {new_path}")
 
-        # Count files for large folder warning
-        file_count = sum(1 for _ in self._path.rglob("*"))
+        # Walk the tree once; the same listing is used for the warning and the permission map
+        items = list(self._path.rglob("*"))
+        file_count = len(items)
         if file_count > 100 and not _confirm_action(
             f"⚠️  Warning: Moving large folder with {file_count} files. "
             f"This may take a while. Continue?",
@@ -2338,47 +1922,56 @@ class SyftFolder:
             print("Operation cancelled.")
             return self
 
-        # Get permissions for all files and folders
-        permission_map = {}
-        for item in self._path.rglob("*"):
+        # Get permissions for all files and folders, remembering which is which
+        # since a move keeps the entry types
+        permission_map: Dict[Path, Tuple[bool, Dict[str, List[str]]]] = {}
+        for item in items:
             if item.is_file():
                 file_obj = SyftFile(item)
-                permission_map[item] = file_obj._get_all_permissions()
+                permission_map[item] = (True, file_obj._get_all_permissions())
             elif item.is_dir():
                 folder_obj = SyftFolder(item)
-                permission_map[item] = folder_obj._get_all_permissions()
+                permission_map[item] = (False, folder_obj._get_all_permissions())
 
         # Also store root folder permissions
-        permission_map[self._path] = self._get_all_permissions()
+        permission_map[self._path] = (False, self._get_all_permissions())
 
         # Create parent directory if needed
         new_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Move the folder
-        shutil.move(str(self._path), str(new_path))
+        _move_path(self._path, new_path)
 
         # Create new SyftFolder instance
         new_folder = SyftFolder(new_path)
 
-        # Reapply all permissions
-        for old_path, perms in permission_map.items():
+        # Group the permissions to reapply by the syft.pub.yaml holding each item's rule
+        grants: Dict[Path, Dict[str, Dict[str, List[str]]]] = {}
+        for old_path, (is_file, perms) in permission_map.items():
             # Calculate new path
             rel_path = old_path.relative_to(self._path)
             new_item_path = new_path / rel_path
 
-            # Apply permissions
-            if new_item_path.is_file():
-                file_obj = SyftFile(new_item_path)
-                for permission, users in perms.items():
-                    for user in users:
-                        if permission in ["read", "create", "write", "admin"]:
-                            file_obj._grant_access(user, permission)  # type: ignore[arg-type]
-            elif new_item_path.is_dir():
-                folder_obj = SyftFolder(new_item_path)
-                for permission, users in perms.items():
-                    for user in users:
-                        if permission in ["read", "create", "write", "admin"]:
-                            folder_obj._grant_access(user, permission)  # type: ignore[arg-type]
+            if is_file:
+                yaml_dir, pattern = new_item_path.parent, new_item_path.name
+            else:
+                yaml_dir, pattern = new_item_path, "**"
+            access = grants.setdefault(yaml_dir, {}).setdefault(pattern, {})
+            for perm, users in perms.items():
+                access[perm] = [*access.get(perm, []), *users]
+
+        # Reapply all permissions with a single write per syft.pub.yaml
+        for yaml_dir, access_by_pattern in grants.items():
+            merged = {
+                pattern: _merge_rule_access(yaml_dir, pattern, access)
+                for pattern, access in access_by_pattern.items()
+            }
+            update_syftpub_yaml_rules(
+                yaml_dir, {pattern: m for pattern, m in merged.items() if m is not None}
+            )
+
+        # Invalidate cache for the moved tree
+        _permission_cache.invalidate(str(new_path))
 
         return new_folder
 
@@ -2395,47 +1988,39 @@ class SyftFolder:
 
         # Check if this folder has its own syft.pub.yaml file
         syftpub_path = self._path / "syft.pub.yaml"
-        if syftpub_path.exists():
+        parsed = _load_syftpub(syftpub_path)
+        if parsed is not None:
             try:
-                with open(syftpub_path, "r") as f:
-                    content = yaml.safe_load(f) or {"rules": []}
-
-                # Process rules from the folder's own yaml file
-                rules = content.get("rules", [])
-                sorted_rules = _sort_rules_by_specificity(rules)
-                for rule in sorted_rules:
-                    pattern = rule.get("pattern", "")
-                    # For the folder's own permissions, we look for "**" pattern
-                    if pattern == "**":
-                        access = rule.get("access", {})
-                        # Check file limits if present
-                        limits = rule.get("limits", {})
-                        if limits and not limits.get("allow_dirs", True):
-                            continue  # Skip this rule for directories
-
-                        # Use this rule's permissions
-                        for perm in ["read", "create", "write", "admin"]:
-                            users = format_users(access.get(perm, []))
-                            result["permissions"][perm] = users
-                            if users:
-                                result["sources"][perm] = [
-                                    {
-                                        "path": syftpub_path,
-                                        "pattern": pattern,
-                                        "terminal": False,
-                                        "inherited": False,
-                                    }
-                                ]
-
-                        result["matched_pattern"] = pattern
-                        return result
+                sorted_rules, _ = parsed
+
+                # For the folder's own permissions, we look for "**" rules
+                for rule in sorted_rules.by_pattern.get("**", ()):
+                    permissions = _rule_permissions(rule)
+                    # Check file limits if present
+                    limits = rule.get("limits", {})
+                    if limits and not limits.get("allow_dirs", True):
+                        continue  # Skip this rule for directories
+
+                    # Use this rule's permissions
+                    source = {
+                        "path": syftpub_path,
+                        "pattern": "**",
+                        "terminal": False,
+                        "inherited": False,
+                    }
+                    for perm in _PERMISSION_LEVELS:
+                        users = permissions[perm]
+                        result["permissions"][perm] = users
+                        if users:
+                            result["sources"][perm] = [source]
+
+                    result["matched_pattern"] = "**"
+                    return result
 
             except Exception:
                 pass
 
         # If no own permissions found, fall back to SyftFile logic for hierarchical search
-        from ._impl import SyftFile
-
         file_obj = SyftFile(self._path)
         return file_obj._get_all_permissions_with_sources()
 
@@ -1,12 +1,31 @@
 """Utility functions for syft_perm."""
 
+import copy
+import os
+import stat
+import sys
+import threading
+from bisect import bisect_left
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
 from ._syftbox import SYFTBOX_AVAILABLE, SyftBoxURL
 from ._syftbox import client as _syftbox_client
+from .core.path_matching import _sort_rules_by_specificity, _SortedRules
+from .core.permissions import _permission_cache
+
+# Prefer the libyaml-backed loader/dumper, fall back to the pure-Python ones
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeDumper as _YamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# Permission levels in the order they appear in syft.pub.yaml access blocks
+_PERMISSION_LEVELS = ("read", "create", "write", "admin")
 
 __all__ = [
     "resolve_path",
@@ -52,6 +71,42 @@ def format_users(users: List[str]) -> List[str]:
     return sorted(unique_users)  # Sort for consistent order
 
 
+def _is_formatted(users: List[str]) -> bool:
+    """Check whether a user list is already in the form format_users returns."""
+    if users == ["*"]:
+        return True
+    if "*" in users or "public" in users:
+        return False
+    return all(a < b for a, b in zip(users, users[1:]))
+
+
+def _add_formatted_user(users: List[str], user: str) -> List[str]:
+    """
+    Return format_users(users + [user]) without re-sorting an already formatted list.
+
+    The user is inserted at its sorted position; lists that are not yet formatted
+    (hand-edited files) go through format_users as before.
+    """
+    if user in ("*", "public") or not _is_formatted(users):
+        return format_users([*users, user])
+    if users == ["*"]:
+        return ["*"]
+    index = bisect_left(users, user)
+    if index < len(users) and users[index] == user:
+        return list(users)
+    return [*users[:index], user, *users[index:]]
+
+
+def _remove_formatted_user(users: List[str], user: str) -> List[str]:
+    """Return format_users with user removed, without re-sorting an already formatted list."""
+    if not _is_formatted(users):
+        return format_users([u for u in users if u != user])
+    index = bisect_left(users, user)
+    if index < len(users) and users[index] == user:
+        return [*users[:index], *users[index + 1 :]]
+    return list(users)
+
+
 def create_access_dict(
     read_users: List[str],
     create_users: Optional[List[str]] = None,
@@ -89,21 +144,56 @@ def update_syftpub_yaml(
     syftpub_path = target_path / "syft.pub.yaml"
     target_path.mkdir(parents=True, exist_ok=True)
 
-    # Read existing rules
+    existing_content = _read_syftpub_for_update(syftpub_path)
+    _set_rule(existing_content, pattern, access_dict, limits_dict)
+
+    # Write back
+    _atomic_write_yaml(syftpub_path, existing_content)
+
+
+def update_syftpub_yaml_rules(
+    target_path: Path, access_by_pattern: Dict[str, Dict[str, List[str]]]
+) -> None:
+    """Update the access of several rules in syft.pub.yaml with a single write"""
+    access_by_pattern = {p: access for p, access in access_by_pattern.items() if access}
+    if not access_by_pattern:
+        return
+
+    syftpub_path = target_path / "syft.pub.yaml"
+    target_path.mkdir(parents=True, exist_ok=True)
+
+    existing_content = _read_syftpub_for_update(syftpub_path)
+    for pattern, access_dict in access_by_pattern.items():
+        _set_rule(existing_content, pattern, access_dict)
+
+    _atomic_write_yaml(syftpub_path, existing_content)
+
+
+def _read_syftpub_for_update(syftpub_path: Path) -> Dict[str, Any]:
+    """Read syft.pub.yaml fresh from disk, falling back to an empty rule list."""
     existing_content: Dict[str, Any] = {"rules": []}
     if syftpub_path.exists():
         try:
             with open(syftpub_path, "r") as f:
-                existing_content = yaml.safe_load(f) or {"rules": []}
+                existing_content = yaml.load(f, Loader=_YamlLoader) or {"rules": []}
         except Exception:
             pass
 
     if not isinstance(existing_content.get("rules"), list):
         existing_content["rules"] = []
+    return existing_content
 
+
+def _set_rule(
+    content: Dict[str, Any],
+    pattern: str,
+    access_dict: Dict[str, List[str]],
+    limits_dict: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Set the access and limits of the rule for pattern, creating the rule if needed."""
     # Find existing rule for this pattern
     existing_rule = None
-    for rule in existing_content["rules"]:
+    for rule in content["rules"]:
         if rule.get("pattern") == pattern:
             existing_rule = rule
             break
@@ -111,7 +201,7 @@ def update_syftpub_yaml(
     # Create new rule or update existing
     if existing_rule is None:
         new_rule = {"pattern": pattern}
-        existing_content["rules"].append(new_rule)
+        content["rules"].append(new_rule)
     else:
         new_rule = existing_rule
 
@@ -128,9 +218,57 @@ def update_syftpub_yaml(
     if limits_dict:
         new_rule["limits"] = limits_dict  # type: ignore[assignment]
 
-    # Write back
-    with open(syftpub_path, "w") as f:
-        yaml.dump(existing_content, f, default_flow_style=False, sort_keys=False, indent=2)
+
+def _render_yaml(content: Dict[str, Any]) -> str:
+    """Render a syft.pub.yaml document the way yaml.dump lays it out."""
+    # A bare terminal flag without rules is common enough to skip the dumper for
+    if content.get("rules") == [] and all(
+        key == "rules" or (key == "terminal" and isinstance(value, bool))
+        for key, value in content.items()
+    ):
+        return "".join(
+            "rules: []\n" if key == "rules" else f"terminal: {'true' if value else 'false'}\n"
+            for key, value in content.items()
+        )
+    return yaml.dump(
+        content, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False, indent=2
+    )
+
+
+def _atomic_write_yaml(path: Path, content: Dict[str, Any]) -> None:
+    """
+    Serialize content to YAML and atomically replace the file at path.
+
+    The document is rendered in memory and written with a single write to a
+    hidden temporary file next to the target, which is then swapped in with
+    os.replace. Readers never observe a partially written file and every
+    update produces a fresh inode. The replaced file's mode is kept.
+    """
+    data = _render_yaml(content).encode("utf-8")
+    # Dot-prefixed so sync clients watching the datasite skip it
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        mode: Optional[int] = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = None
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def is_datasite_email(email: str) -> bool:
@@ -165,41 +303,116 @@ def is_datasite_email(email: str) -> bool:
     return False
 
 
-def read_syftpub_yaml(path: Path, pattern: str) -> Optional[Dict[str, List[str]]]:
-    """Read permissions from syft.pub.yaml for a specific pattern"""
-    syftpub_path = path / "syft.pub.yaml"
-    if not syftpub_path.exists():
+def _load_syftpub(syftpub_path: Path) -> Optional[Tuple[_SortedRules, bool]]:
+    """
+    Parse a syft.pub.yaml file into its rules sorted by specificity and its terminal flag.
+
+    The stat() used to stamp the cache doubles as the existence check, and the
+    parsed result is reused until the file's mtime, size or inode changes. Callers
+    must treat the returned rules as read-only.
+
+    Returns:
+        (sorted_rules, is_terminal), or None if the file is missing or cannot be parsed
+    """
+    path_str = str(syftpub_path)
+    try:
+        st = os.stat(path_str)
+    except OSError:
         return None
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cached = _permission_cache.get_yaml(path_str, stamp)
+    if cached is not None:
+        return cached
 
     try:
-        with open(syftpub_path, "r") as f:
-            content = yaml.safe_load(f) or {"rules": []}
-        for rule in content.get("rules", []):
-            if rule.get("pattern") == pattern:
-                access = rule.get("access")
-                if isinstance(access, dict):
-                    return access
-                return None
+        # libyaml decodes the raw bytes itself, so skip the text-mode wrapper
+        with open(path_str, "rb") as f:
+            content = yaml.load(f, Loader=_YamlLoader) or {"rules": []}
+        sorted_rules = _SortedRules(_sort_rules_by_specificity(content.get("rules", [])))
+        parsed = (sorted_rules, bool(content.get("terminal", False)))
     except Exception:
-        pass
+        return None
+    _permission_cache.set_yaml(path_str, stamp, parsed)
+    return parsed
+
+
+def _rule_permissions(rule: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Get the formatted permissions granted by a rule returned from _load_syftpub.
+
+    The formatted user lists are computed once per rule and kept on the cached
+    rule; callers receive fresh lists they are free to modify. User names are
+    interned so the same user shares one string across all cached rules.
+    """
+    permissions = rule.get("_permissions")
+    if permissions is None:
+        access = rule.get("access", {})
+        permissions = {
+            perm: [
+                sys.intern(user) if isinstance(user, str) else user
+                for user in format_users(access.get(perm, []))
+            ]
+            for perm in _PERMISSION_LEVELS
+        }
+        rule["_permissions"] = permissions
+    return {perm: list(users) for perm, users in permissions.items()}
+
+
+def _find_rule(path: Path, pattern: str) -> Optional[Dict[str, Any]]:
+    """Find the first rule for pattern in path/syft.pub.yaml, using the parsed-file cache."""
+    parsed = _load_syftpub(path / "syft.pub.yaml")
+    if parsed is None:
+        return None
+    # Sorting by specificity is stable, so rules sharing a pattern keep their file order
+    rules = parsed[0].by_pattern.get(pattern)
+    return rules[0] if rules else None
+
+
+def read_syftpub_yaml(path: Path, pattern: str) -> Optional[Dict[str, List[str]]]:
+    """Read permissions from syft.pub.yaml for a specific pattern"""
+    rule = _find_rule(path, pattern)
+    if rule is None:
+        return None
+    access = rule.get("access")
+    if isinstance(access, dict):
+        # Copy, since the parsed rule is shared with the cache
+        return copy.deepcopy(access)
     return None
 
 
+def _merge_rule_access(
+    path: Path, pattern: str, access_dict: Dict[str, List[str]]
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Merge users into the access of the rule for pattern, like repeated grants would.
+
+    Returns:
+        The merged access to write, or None if nothing would change (all users are
+        already granted, or there is no rule and nothing to grant)
+    """
+    existing = read_syftpub_yaml(path, pattern)
+    current = existing or {}
+
+    merged = {
+        perm: format_users([*current.get(perm, []), *access_dict.get(perm, [])])
+        for perm in _PERMISSION_LEVELS
+    }
+    if existing is None and not any(access_dict.get(perm) for perm in merged):
+        return None  # Nothing to grant, don't create an empty rule
+    # Compare normalized lists, so unsorted or duplicated hand-edited users still count
+    if existing is not None and all(
+        merged[perm] == format_users(current.get(perm, [])) for perm in merged
+    ):
+        return None  # Already granted, nothing to write
+    return merged
+
+
 def read_syftpub_yaml_full(path: Path, pattern: str) -> Optional[Dict[str, Any]]:
     """Read full rule (access and limits) from syft.pub.yaml for a specific pattern"""
-    syftpub_path = path / "syft.pub.yaml"
-    if not syftpub_path.exists():
+    rule = _find_rule(path, pattern)
+    if rule is None:
         return None
-
-    try:
-        with open(syftpub_path, "r") as f:
-            content = yaml.safe_load(f) or {"rules": []}
-        for rule in content.get("rules", []):
-            if rule.get("pattern") == pattern:
-                return {"access": rule.get("access", {}), "limits": rule.get("limits", {})}
-    except Exception:
-        pass
-    return None
+    return copy.deepcopy({"access": rule.get("access", {}), "limits": rule.get("limits", {})})
 
 
 def get_syftbox_datasites() -> List[str]:
@@ -5,6 +5,7 @@ from .path_matching import (
     _calculate_glob_specificity,
     _doublestar_match,
     _glob_match,
+    _iter_matching_rules,
     _sort_rules_by_specificity,
 )
 from .permissions import (
@@ -12,6 +13,9 @@ from .permissions import (
     PermissionReason,
     PermissionResult,
     _is_owner,
+    _is_owner_in_scope,
+    _resolve_datasite_owner,
+    _resolve_owner_scope,
     clear_permission_cache,
     get_cache_stats,
 )
@@ -27,9 +31,13 @@ __all__ = [
     "get_cache_stats",
     "clear_permission_cache",
     "_is_owner",
+    "_is_owner_in_scope",
+    "_resolve_datasite_owner",
+    "_resolve_owner_scope",
     "_acl_norm_path",
     "_doublestar_match",
     "_glob_match",
+    "_iter_matching_rules",
     "_calculate_glob_specificity",
     "_sort_rules_by_specificity",
     "PermissionExplanation",
@@ -1,6 +1,9 @@
 """Path matching and glob pattern utilities extracted from syft_perm implementation."""
 
+import re
+from functools import lru_cache
 from pathlib import PurePath
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
 
 
 def _acl_norm_path(path: str) -> str:
@@ -341,3 +344,182 @@ def _sort_rules_by_specificity(rules: list) -> list:
 
     # Return just the rules
     return [rule for rule, score in rules_with_scores]
+
+
+def _simple_glob_regex(pattern: str) -> Optional[str]:
+    """
+    Translate a pattern without ** into a regex with the same result as _match_simple_glob.
+
+    Returns None for patterns mixing * with ? or [] - those can match "/" and
+    _match_simple_glob only backtracks the last *, which a regex can't mirror.
+    """
+    if "*" in pattern and ("?" in pattern or "[" in pattern):
+        return None
+
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "*":
+            parts.append("[^/]*")  # Single * never crosses directory boundaries
+        elif c == "?":
+            parts.append(".")
+        elif c == "[":
+            # Mirror _match_char_class, including its parsing of ranges
+            end = pattern.find("]", i + 1)
+            char_class = pattern[i + 1 : end] if end != -1 else ""
+            if not char_class:
+                parts.append("(?!)")  # Unclosed or empty classes never match
+                break
+            negate = char_class[0] in "!^"
+            if negate:
+                char_class = char_class[1:]
+            members = []
+            j = 0
+            while j < len(char_class):
+                if j + 2 < len(char_class) and char_class[j + 1] == "-":
+                    if char_class[j] <= char_class[j + 2]:
+                        members.append(f"{re.escape(char_class[j])}-{re.escape(char_class[j + 2])}")
+                    j += 3
+                else:
+                    members.append(re.escape(char_class[j]))
+                    j += 1
+            if members:
+                parts.append(("[^" if negate else "[") + "".join(members) + "]")
+            else:
+                parts.append("." if negate else "(?!)")
+            i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+
+    # _match_simple_glob always accepts an exact (literal) match
+    return f"(?:{re.escape(pattern)}|{''.join(parts)})"
+
+
+@lru_cache(maxsize=4096)
+def _glob_to_regex(pattern: str) -> Optional[str]:
+    """
+    Translate a glob pattern into a regex equivalent to _glob_match on normalized paths.
+
+    Supports "**", patterns without **, "**/<pattern>" and "<literal>/**".
+    Returns None for other shapes, which must be matched with _glob_match.
+    """
+    pattern = _acl_norm_path(pattern)
+
+    body: Optional[str]
+    if pattern == "**":
+        body = ".*"
+    elif "**" not in pattern:
+        body = _simple_glob_regex(pattern)
+    elif pattern.startswith("**/") and "**" not in pattern[3:]:
+        # Leading **/ tries the rest at every segment of a non-empty path
+        suffix = _simple_glob_regex(pattern[3:])
+        body = None if suffix is None else "(?=.)(?:.*/)?" + suffix
+    elif pattern.endswith("/**") and "**" not in pattern[:-3]:
+        # Trailing /** needs something below the (literally compared) prefix
+        body = re.escape(pattern[:-3]) + "/.+"
+    else:
+        return None
+
+    if body is None:
+        return None
+    return f"{re.escape(pattern)}|{body}"
+
+
+@lru_cache(maxsize=1024)
+def _compile_rule_patterns(patterns: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    """
+    Compile rule patterns into one alternation regex with a named group per rule.
+
+    A full match of the combined regex selects the first pattern (in order) that
+    matches, so finding the nearest rule is one regex call instead of one glob
+    match per rule. Returns None if any pattern can't be translated.
+    """
+    alternatives = []
+    for index, pattern in enumerate(patterns):
+        if not isinstance(pattern, str):
+            return None
+        regex = _glob_to_regex(pattern)
+        if regex is None:
+            return None
+        alternatives.append(f"(?P<r{index}>{regex})")
+    return re.compile("|".join(alternatives), re.DOTALL)
+
+
+def _match_first(
+    combined: Optional[Pattern[str]], patterns: Tuple[str, ...], path: str
+) -> Optional[int]:
+    """
+    Find the first pattern that matches path.
+
+    Args:
+        combined: The patterns' combined regex from _compile_rule_patterns, or None
+            to match them one at a time
+        patterns: Glob patterns in evaluation order
+        path: Path to match against the patterns
+
+    Returns:
+        Optional[int]: Index of the first matching pattern, or None
+    """
+    if combined is None:
+        for index, pattern in enumerate(patterns):
+            if _glob_match(pattern, path):
+                return index
+        return None
+
+    match = combined.fullmatch(_acl_norm_path(path))
+    if match is None or match.lastgroup is None:
+        return None
+    return int(match.lastgroup[1:])
+
+
+class _SortedRules(List[Dict[str, Any]]):
+    """
+    Rules sorted by specificity, with the lookups derived from them built once.
+
+    Parsed syft.pub.yaml files are cached as instances of this list, so the
+    pattern index and the combined match regex are shared by every lookup
+    until the file changes.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        super().__init__(rules)
+        self.patterns = tuple(rule.get("pattern", "") for rule in self)
+        self.combined: Optional[Pattern[str]] = None
+        try:
+            self.combined = _compile_rule_patterns(self.patterns)
+        except TypeError:
+            pass  # Unhashable patterns in a malformed file fail when matched instead
+        self.by_pattern: Dict[str, List[Dict[str, Any]]] = {}
+        for rule in self:
+            pattern = rule.get("pattern")
+            if isinstance(pattern, str):
+                self.by_pattern.setdefault(pattern, []).append(rule)
+
+
+def _iter_matching_rules(rules: list, path: str) -> Iterator[dict]:
+    """
+    Yield the rules whose pattern matches path, in order.
+
+    Callers normally stop at the first rule; later rules are only searched when a
+    rule is skipped (for example because of file limits).
+
+    Args:
+        rules: Rule dictionaries, usually sorted by specificity
+        path: Path to match against the rule patterns
+    """
+    if isinstance(rules, _SortedRules):
+        patterns, combined = rules.patterns, rules.combined
+    else:
+        patterns = tuple(rule.get("pattern", "") for rule in rules)
+        combined = _compile_rule_patterns(patterns)
+    start = 0
+    while start < len(patterns):
+        if start:
+            combined = _compile_rule_patterns(patterns[start:])
+        index = _match_first(combined, patterns[start:], path)
+        if index is None:
+            return
+        yield rules[start + index]
+        start += index + 1
@@ -1,10 +1,12 @@
 """Permission-related components for SyftPerm."""
 
+import sys
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from .path_matching import _acl_norm_path
 
@@ -37,9 +39,12 @@ class PermissionResult:
 class PermissionCache:
     """Simple LRU cache for permission lookups to match old ACL performance."""
 
-    def __init__(self, max_size: int = 10000):
+    def __init__(self, max_size: int = 10000, max_yaml_files: int = 1024):
         self.cache: OrderedDict[str, Dict[str, List[str]]] = OrderedDict()
         self.max_size = max_size
+        # Parsed syft.pub.yaml files keyed by path, stamped with (mtime_ns, size, inode)
+        self.yaml_cache: OrderedDict[str, Tuple[Tuple[int, int, int], Any]] = OrderedDict()
+        self.max_yaml_files = max_yaml_files
 
     def get(self, path: str) -> Optional[Dict[str, List[str]]]:
         """Get permissions from cache if available."""
@@ -64,10 +69,30 @@ class PermissionCache:
         keys_to_remove = [k for k in self.cache if k.startswith(path_prefix)]
         for key in keys_to_remove:
             del self.cache[key]
+        yaml_keys_to_remove = [k for k in self.yaml_cache if k.startswith(path_prefix)]
+        for key in yaml_keys_to_remove:
+            del self.yaml_cache[key]
+
+    def get_yaml(self, path: str, stamp: Tuple[int, int, int]) -> Optional[Any]:
+        """Get a parsed syft.pub.yaml if it was cached for the same file version."""
+        entry = self.yaml_cache.get(path)
+        if entry is None or entry[0] != stamp:
+            return None
+        self.yaml_cache.move_to_end(path)
+        return entry[1]
+
+    def set_yaml(self, path: str, stamp: Tuple[int, int, int], parsed: Any) -> None:
+        """Cache a parsed syft.pub.yaml for the given file version."""
+        if path in self.yaml_cache:
+            self.yaml_cache.move_to_end(path)
+        elif len(self.yaml_cache) >= self.max_yaml_files:
+            self.yaml_cache.popitem(last=False)
+        self.yaml_cache[path] = (stamp, parsed)
 
     def clear(self) -> None:
         """Clear all cache entries."""
         self.cache.clear()
+        self.yaml_cache.clear()
 
 
 # Global cache instance
@@ -80,6 +105,7 @@ def get_cache_stats() -> Dict[str, Any]:
         "size": len(_permission_cache.cache),
         "max_size": _permission_cache.max_size,
         "keys": list(_permission_cache.cache.keys()),
+        "yaml_files": len(_permission_cache.yaml_cache),
     }
 
 
@@ -100,22 +126,65 @@ def _is_owner(path: str, user: str) -> bool:
     Returns:
         bool: True if user is owner
     """
+    return _is_owner_in_scope(_resolve_owner_scope(path), user)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_owner_scope(path: str) -> Tuple[Optional[str], FrozenSet[str]]:
+    """
+    Precompute the path-dependent part of the owner check.
+
+    The result only depends on the path, so it is memoized, and callers checking
+    many users against the same path can reuse it with _is_owner_in_scope.
+
+    Args:
+        path: File/directory path (absolute or relative)
+
+    Returns:
+        tuple: (datasites-relative path or None, path components)
+    """
     path_str = str(path)
 
     # Convert to datasites-relative path if it's an absolute path
     if "datasites" in path_str:
-        # Find the datasites directory and extract the relative path from there
-        parts = path_str.split("datasites")
-        if len(parts) > 1:
-            # Take everything after "datasites/" and normalize it
-            datasites_relative = parts[-1].lstrip("/\\")
-            normalized_path = _acl_norm_path(datasites_relative)
-            return normalized_path.startswith(user)
+        # Take everything after the last "datasites/" and normalize it
+        datasites_relative = path_str.rpartition("datasites")[2].lstrip("/\\")
+        return _acl_norm_path(datasites_relative), frozenset()
 
     # If not under datasites, check if any path component matches the user
     # This handles both relative paths and test scenarios
     normalized_path = _acl_norm_path(path_str)
-    path_parts = normalized_path.split("/")
+    return None, frozenset(normalized_path.split("/"))
+
+
+@lru_cache(maxsize=4096)
+def _resolve_datasite_owner(path: str) -> Optional[str]:
+    """
+    Extract the datasite owner from a path like /SyftBox/datasites/user@domain.com/...
+
+    Args:
+        path: File/directory path
+
+    Returns:
+        Optional[str]: The owner's email, or None if the path is not inside a datasite
+    """
+    path_str = str(path)
+    if "datasites" not in path_str:
+        return None
+
+    datasites_relative = path_str.rpartition("datasites")[2].lstrip("/\\")
+    first_segment = datasites_relative.partition("/")[0]
+    if "@" in first_segment:
+        # Interned so every path in a datasite shares the owner string with the rule users
+        return sys.intern(first_segment)
+    return None
+
+
+def _is_owner_in_scope(scope: Tuple[Optional[str], FrozenSet[str]], user: str) -> bool:
+    """Check ownership against a scope computed by _resolve_owner_scope."""
+    datasites_relative, path_parts = scope
+    if datasites_relative is not None:
+        return datasites_relative.startswith(user)
 
     # Check if any path component is the user (for owner detection)
     return user in path_parts
@@ -15,8 +15,13 @@ def generate_editor_html(
     is_dark_mode: bool = False,
     syft_user: Optional[str] = None,
     is_new_file: bool = False,
+    head_script: str = "",
 ) -> str:
-    """Generate the HTML for the filesystem code editor."""
+    """Generate the HTML for the filesystem code editor.
+
+    ``head_script`` is emitted ahead of every other script, so it can patch
+    browser APIs before the editor code runs.
+    """
 
     initial_path = initial_path or str(Path.home())
 
@@ -72,7 +77,7 @@ def generate_editor_html(
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>SyftBox File Editor</title>
     <link href="https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/themes/{('prism-tomorrow' if is_dark_mode else 'prism')}.min.css" rel="stylesheet">
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/components/prism-core.min.js"></script>
+    {head_script}<script src="https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/components/prism-core.min.js"></script>
     <script src="https://cdnjs.cloudflare.com/ajax/libs/prism/1.29.0/plugins/autoloader/prism-autoloader.min.js"></script>
     <style>
     {styles}
@@ -289,6 +289,10 @@ def get_editor_javascript(
                     this.currentPath = data.path;
                     this.isAdmin = data.can_admin || false;  // Update admin status for the directory
                     this.renderFileList(data.items);
+                    if (data.truncated) {{
+                        // Listings embedded by the offline viewer may be capped
+                        this.fileList.insertAdjacentHTML('beforeend', `<div class="empty-state"><p>Showing ${{data.items.length}} of ${{data.total_items}} items</p></div>`);
+                    }}
                     this.renderBreadcrumb(data.path, data.parent);
                     this.updateUI();  // Update UI to reflect admin status
                 }} catch (error) {{
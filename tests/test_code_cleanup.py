@@ -105,6 +105,28 @@ class TestCodeCleanup(unittest.TestCase):
         self.assertIn("user2@example.com", perms["write"])
         self.assertIn("admin@example.com", perms["admin"])
 
+    def test_permission_table_reports_each_pattern_once(self):
+        """Pattern reasons repeated across permission levels collapse to one entry."""
+        test_file = Path(self.test_dir) / "notes.txt"
+        test_file.write_text("content")
+        yaml_content = {
+            "rules": [
+                {
+                    "pattern": "*.txt",
+                    "access": {"read": ["alice@example.com"], "write": ["alice@example.com"]},
+                }
+            ]
+        }
+        with open(Path(self.test_dir) / "syft.pub.yaml", "w") as f:
+            yaml.dump(yaml_content, f)
+
+        rows = syft_perm.open(test_file)._get_permission_table()
+
+        self.assertEqual(len(rows), 1)
+        reasons = rows[0][5].split("; ")
+        self.assertEqual(reasons.count("Pattern '*.txt' matched"), 1)
+        self.assertIn("[Write] Explicitly granted write", reasons[0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -12,6 +12,7 @@ import yaml
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import syft_perm  # noqa: E402
+from syft_perm.core import _glob_match, _iter_matching_rules  # noqa: E402
 
 
 class TestDoublestarPatterns(unittest.TestCase):
@@ -540,6 +541,42 @@ class TestDoublestarPatterns(unittest.TestCase):
             "api/**/endpoints.py should match api/v1/endpoints.py",
         )
 
+    def test_compiled_rule_matching_agrees_with_glob_match(self):
+        """Single-pass rule matching picks the same rules as per-pattern _glob_match."""
+        patterns = [
+            "**",
+            "*.txt",
+            "**/*.py",
+            "src/**",
+            "src/**/test.py",
+            "docs/*.md",
+            "data/file?.csv",
+            "[ab]*.log",
+            "exact.txt",
+            "a.b/**",
+        ]
+        rules = [{"pattern": p} for p in patterns]
+        paths = [
+            "exact.txt",
+            "notes.txt",
+            "src",
+            "src/test.py",
+            "src/lib/test.py",
+            "src/lib/main.py",
+            "docs/readme.md",
+            "docs/api/readme.md",
+            "data/file1.csv",
+            "data/file10.csv",
+            "alpha.log",
+            "c.log",
+            "a.b/x",
+            "axb/x",
+        ]
+        for path in paths:
+            expected = [r["pattern"] for r in rules if _glob_match(r["pattern"], path)]
+            actual = [r["pattern"] for r in _iter_matching_rules(rules, path)]
+            self.assertEqual(actual, expected, f"mismatch for {path}")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,104 @@
+"""Test that idempotent grants and revokes leave syft.pub.yaml untouched."""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import syft_perm  # noqa: E402
+from syft_perm._impl import _permission_cache  # noqa: E402
+
+
+class TestGrantRevokeNoop(unittest.TestCase):
+    """Grant/revoke calls that do not change permissions should not rewrite yaml files."""
+
+    def setUp(self):
+        """Create a temporary directory for testing."""
+        self.test_dir = tempfile.mkdtemp()
+        _permission_cache.clear()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.test_dir)
+        _permission_cache.clear()
+
+    def _yaml_state(self, yaml_path: Path):
+        stat = yaml_path.stat()
+        return stat.st_mtime_ns, yaml_path.read_text()
+
+    def test_regrant_existing_user_does_not_rewrite_file_yaml(self):
+        """Granting a permission a user already has is a no-op."""
+        test_file = Path(self.test_dir) / "data.txt"
+        test_file.write_text("content")
+
+        syft_file = syft_perm.open(test_file)
+        syft_file.grant_read_access("alice@example.com", force=True)
+
+        yaml_path = Path(self.test_dir) / "syft.pub.yaml"
+        before = self._yaml_state(yaml_path)
+
+        syft_file.grant_read_access("alice@example.com", force=True)
+
+        self.assertEqual(self._yaml_state(yaml_path), before)
+        self.assertTrue(syft_file.has_read_access("alice@example.com"))
+
+    def test_revoke_absent_user_does_not_rewrite_folder_yaml(self):
+        """Revoking a permission a user does not have is a no-op."""
+        test_folder = Path(self.test_dir) / "shared"
+        test_folder.mkdir()
+
+        syft_folder = syft_perm.open(test_folder)
+        syft_folder.grant_write_access("alice@example.com", force=True)
+
+        yaml_path = test_folder / "syft.pub.yaml"
+        before = self._yaml_state(yaml_path)
+
+        syft_folder.revoke_write_access("bob@example.com")
+
+        self.assertEqual(self._yaml_state(yaml_path), before)
+        self.assertTrue(syft_folder.has_write_access("alice@example.com"))
+
+    def test_revoke_without_rule_still_creates_rule(self):
+        """Revoking on a file with no rule of its own still writes an explicit empty rule."""
+        test_file = Path(self.test_dir) / "data.txt"
+        test_file.write_text("content")
+
+        syft_file = syft_perm.open(test_file)
+        syft_file.revoke_read_access("alice@example.com")
+
+        yaml_path = Path(self.test_dir) / "syft.pub.yaml"
+        self.assertTrue(yaml_path.exists())
+        with open(yaml_path) as f:
+            content = yaml.safe_load(f)
+        patterns = [rule["pattern"] for rule in content["rules"]]
+        self.assertIn("data.txt", patterns)
+
+    def test_grant_keeps_users_sorted(self):
+        """Grants insert users in sorted order, also into hand-edited unsorted lists."""
+        test_file = Path(self.test_dir) / "data.txt"
+        test_file.write_text("content")
+        yaml_path = Path(self.test_dir) / "syft.pub.yaml"
+        yaml_path.write_text(
+            "rules:\n- pattern: data.txt\n  access:\n    read: [dave@example.com, bob@example.com]\n"
+        )
+
+        syft_file = syft_perm.open(test_file)
+        syft_file.grant_read_access("carol@example.com", force=True)
+        syft_file.grant_read_access("alice@example.com", force=True)
+        syft_file.revoke_read_access("bob@example.com")
+
+        with open(yaml_path) as f:
+            content = yaml.safe_load(f)
+        self.assertEqual(
+            content["rules"][0]["access"]["read"],
+            ["alice@example.com", "carol@example.com", "dave@example.com"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -481,6 +481,130 @@ class TestMovementBetweenDirectories(unittest.TestCase):
         self.assertFalse(syft_cache_after_clear.has_admin_access("alice@example.com"))
         self.assertTrue(syft_cache_after_clear.has_read_access("bob@example.com"))
 
+    def test_move_file_and_its_permissions_preserves_permissions(self):
+        """Test that move_file_and_its_permissions carries permissions to the destination."""
+        source_dir = Path(self.test_dir) / "source"
+        dest_dir = Path(self.test_dir) / "dest" / "nested"
+        source_dir.mkdir(parents=True)
+
+        source_file = source_dir / "report.txt"
+        source_file.write_text("report")
+
+        syft_file = syft_perm.open(source_file)
+        syft_file.grant_read_access("*")
+
+        moved = syft_file.move_file_and_its_permissions(dest_dir / "report.txt")
+
+        self.assertFalse(source_file.exists())
+        self.assertTrue((dest_dir / "report.txt").exists())
+        self.assertEqual(moved._path, dest_dir / "report.txt")
+        self.assertTrue(moved.has_read_access("anyone@example.com"))
+        self.assertFalse(moved.has_write_access("anyone@example.com"))
+
+    def test_move_file_and_its_permissions_writes_yaml_once(self):
+        """Test that all users and permission levels land in a single destination rule."""
+        source_dir = Path(self.test_dir) / "source"
+        dest_dir = Path(self.test_dir) / "dest"
+        source_dir.mkdir()
+        dest_dir.mkdir()
+
+        source_file = source_dir / "data.csv"
+        source_file.write_text("a,b")
+        with open(source_dir / "syft.pub.yaml", "w") as f:
+            yaml.dump(
+                {
+                    "rules": [
+                        {
+                            "pattern": "data.csv",
+                            "access": {
+                                "read": ["alice@example.com", "bob@example.com"],
+                                "write": ["carol@example.com"],
+                            },
+                        }
+                    ]
+                },
+                f,
+            )
+
+        moved = syft_perm.open(source_file).move_file_and_its_permissions(dest_dir / "data.csv")
+
+        with open(dest_dir / "syft.pub.yaml") as f:
+            rules = yaml.safe_load(f)["rules"]
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(rules[0]["pattern"], "data.csv")
+        self.assertEqual(rules[0]["access"]["read"], ["alice@example.com", "bob@example.com"])
+        self.assertEqual(rules[0]["access"]["write"], ["carol@example.com"])
+        self.assertTrue(moved.has_read_access("bob@example.com"))
+        self.assertTrue(moved.has_write_access("carol@example.com"))
+
+    def test_move_file_and_its_permissions_rejects_existing_destination(self):
+        """Test that moving onto an existing file raises instead of overwriting it."""
+        source_file = Path(self.test_dir) / "a.txt"
+        dest_file = Path(self.test_dir) / "b.txt"
+        source_file.write_text("a")
+        dest_file.write_text("b")
+
+        with self.assertRaises(FileExistsError):
+            syft_perm.open(source_file).move_file_and_its_permissions(dest_file)
+        self.assertEqual(dest_file.read_text(), "b")
+
+    def test_move_folder_and_permissions_reapplies_permissions(self):
+        """Test that a moved folder and its files keep their effective permissions."""
+        source_dir = Path(self.test_dir) / "project"
+        (source_dir / "sub").mkdir(parents=True)
+        (source_dir / "sub" / "notes.txt").write_text("notes")
+        with open(source_dir / "syft.pub.yaml", "w") as f:
+            yaml.dump(
+                {
+                    "rules": [
+                        {
+                            "pattern": "**",
+                            "access": {
+                                "read": ["alice@example.com", "bob@example.com"],
+                                "write": ["carol@example.com"],
+                            },
+                        }
+                    ]
+                },
+                f,
+            )
+
+        dest_dir = Path(self.test_dir) / "archive" / "project"
+        moved = syft_perm.open(source_dir).move_folder_and_permissions(dest_dir, force=True)
+
+        self.assertFalse(source_dir.exists())
+        self.assertEqual(moved._path, dest_dir)
+        self.assertTrue(moved.has_read_access("bob@example.com"))
+        self.assertTrue(moved.has_write_access("carol@example.com"))
+
+        moved_file = syft_perm.open(dest_dir / "sub" / "notes.txt")
+        self.assertTrue(moved_file.has_read_access("alice@example.com"))
+        self.assertFalse(moved_file.has_admin_access("alice@example.com"))
+
+        with open(dest_dir / "sub" / "syft.pub.yaml") as f:
+            rules = yaml.safe_load(f)["rules"]
+        self.assertEqual(len(rules), 2)
+
+    def test_move_folder_keeps_yaml_that_already_grants_everything(self):
+        """Rules that already grant the moved permissions are not rewritten, even unsorted."""
+        source_dir = Path(self.test_dir) / "project"
+        source_dir.mkdir()
+        yaml_path = source_dir / "syft.pub.yaml"
+        yaml_path.write_text(
+            "rules:\n"
+            "- pattern: '**'\n"
+            "  access: {read: [public, bob@example.com], write: [carol@example.com]}\n"
+            "- pattern: syft.pub.yaml\n"
+            "  access: {read: [bob@example.com, alice@example.com, alice@example.com]}\n"
+        )
+        before = (yaml_path.stat().st_mtime_ns, yaml_path.read_text())
+
+        dest_dir = Path(self.test_dir) / "archive" / "project"
+        syft_perm.open(source_dir).move_folder_and_permissions(dest_dir, force=True)
+
+        moved_yaml = dest_dir / "syft.pub.yaml"
+        self.assertEqual((moved_yaml.stat().st_mtime_ns, moved_yaml.read_text()), before)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,51 @@
+"""Test the read-only HTML viewer used when the permission editor server is unavailable."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import syft_perm  # noqa: E402
+from syft_perm import _impl  # noqa: E402
+
+
+class TestOfflineViewer(unittest.TestCase):
+    """Test rendering of the offline viewer."""
+
+    def setUp(self):
+        """Create a temporary directory for testing."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.test_dir)
+
+    def _render_offline(self, path: Path) -> str:
+        with mock.patch("syft_perm._get_file_editor_url", return_value="unavailable"):
+            return syft_perm.open(path)._repr_html_()
+
+    def test_renders_folder_with_non_utf8_filename(self):
+        """Undecodable filenames are escaped instead of breaking the page."""
+        folder = Path(self.test_dir) / "shared"
+        folder.mkdir()
+        try:
+            with open(os.path.join(os.fsencode(folder), b"bad\xff.txt"), "wb") as f:
+                f.write(b"content")
+        except OSError:
+            self.skipTest("filesystem rejects non-UTF-8 filenames")
+
+        for orjson in (_impl._orjson, None):
+            with self.subTest(orjson=orjson is not None):
+                with mock.patch.object(_impl, "_orjson", orjson):
+                    html = self._render_offline(folder)
+                html.encode("utf-8")
+                self.assertIn("bad\\udcff.txt", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
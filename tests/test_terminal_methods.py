@@ -162,6 +162,22 @@ class TestTerminalMethods(unittest.TestCase):
         permissions = folder._permissions_dict
         self.assertIsInstance(permissions, dict)
 
+    def test_terminal_set_same_value_keeps_file(self):
+        """Test that re-setting the current terminal value does not rewrite the YAML."""
+        test_folder = self.test_path / "test_folder"
+        test_folder.mkdir()
+
+        folder = syft_perm.open(test_folder)
+        folder.set_terminal(True)
+
+        yaml_file = test_folder / "syft.pub.yaml"
+        before = yaml_file.stat().st_mtime_ns
+
+        folder.set_terminal(True)
+
+        self.assertEqual(yaml_file.stat().st_mtime_ns, before)
+        self.assertTrue(folder.get_terminal())
+
 
 if __name__ == "__main__":
     unittest.main()
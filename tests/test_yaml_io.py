@@ -0,0 +1,149 @@
+"""Test reading and writing of syft.pub.yaml files."""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import syft_perm  # noqa: E402
+from syft_perm._impl import _permission_cache  # noqa: E402
+from syft_perm._utils import _load_syftpub, update_syftpub_yaml  # noqa: E402
+
+
+class TestYamlIO(unittest.TestCase):
+    """Test how permission files are persisted and loaded."""
+
+    def setUp(self):
+        """Create a temporary directory for testing."""
+        self.test_dir = tempfile.mkdtemp()
+        _permission_cache.clear()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.test_dir)
+        _permission_cache.clear()
+
+    def test_update_replaces_file_atomically(self):
+        """Updates swap in a new file and leave no temporary files behind."""
+        target = Path(self.test_dir)
+        update_syftpub_yaml(target, "**", {"read": ["alice@example.com"]})
+
+        yaml_path = target / "syft.pub.yaml"
+        first_inode = yaml_path.stat().st_ino
+
+        update_syftpub_yaml(target, "**", {"read": ["alice@example.com", "bob@example.com"]})
+
+        self.assertNotEqual(yaml_path.stat().st_ino, first_inode)
+        self.assertEqual([p.name for p in target.iterdir()], ["syft.pub.yaml"])
+        with open(yaml_path) as f:
+            content = yaml.safe_load(f)
+        self.assertEqual(
+            content["rules"][0]["access"]["read"], ["alice@example.com", "bob@example.com"]
+        )
+
+    def test_update_keeps_file_mode(self):
+        """Replacing the file keeps the permission bits of the one it replaces."""
+        target = Path(self.test_dir)
+        update_syftpub_yaml(target, "**", {"read": ["alice@example.com"]})
+        yaml_path = target / "syft.pub.yaml"
+        yaml_path.chmod(0o600)
+
+        update_syftpub_yaml(target, "**", {"read": ["bob@example.com"]})
+
+        self.assertEqual(yaml_path.stat().st_mode & 0o777, 0o600)
+
+    def test_set_terminal_preserves_rules(self):
+        """set_terminal rewrites the file without dropping existing rules."""
+        test_folder = Path(self.test_dir) / "folder"
+        test_folder.mkdir()
+
+        folder = syft_perm.open(test_folder)
+        folder.grant_read_access("alice@example.com", force=True)
+        folder.set_terminal(True)
+
+        with open(test_folder / "syft.pub.yaml") as f:
+            content = yaml.safe_load(f)
+        self.assertTrue(content["terminal"])
+        self.assertEqual(content["rules"][0]["pattern"], "**")
+        self.assertEqual([p.name for p in test_folder.iterdir()], ["syft.pub.yaml"])
+
+    def test_set_terminal_without_rules_matches_dumper_output(self):
+        """A terminal flag on a folder without rules is written as yaml.dump would."""
+        test_folder = Path(self.test_dir) / "folder"
+        test_folder.mkdir()
+
+        syft_perm.open(test_folder).set_terminal(True)
+
+        yaml_path = test_folder / "syft.pub.yaml"
+        expected = yaml.dump(
+            {"rules": [], "terminal": True}, default_flow_style=False, sort_keys=False, indent=2
+        )
+        self.assertEqual(yaml_path.read_text(), expected)
+        self.assertEqual(_load_syftpub(yaml_path), ([], True))
+
+    def test_parsed_yaml_is_reused_until_file_changes(self):
+        """Repeated loads reuse the parsed content; rewriting the file reparses it."""
+        target = Path(self.test_dir)
+        update_syftpub_yaml(target, "**", {"read": ["alice@example.com"]})
+        yaml_path = target / "syft.pub.yaml"
+
+        first = _load_syftpub(yaml_path)
+        self.assertIs(_load_syftpub(yaml_path), first)
+
+        update_syftpub_yaml(target, "*.txt", {"write": ["bob@example.com"]})
+        sorted_rules, is_terminal = _load_syftpub(yaml_path)
+        self.assertIsNot(sorted_rules, first[0])
+        self.assertEqual([r["pattern"] for r in sorted_rules], ["*.txt", "**"])
+        self.assertFalse(is_terminal)
+
+    def test_clearing_permission_cache_drops_parsed_yaml(self):
+        """Clearing the permission cache also forgets parsed yaml files."""
+        target = Path(self.test_dir)
+        update_syftpub_yaml(target, "**", {"read": ["alice@example.com"]})
+        yaml_path = target / "syft.pub.yaml"
+
+        first = _load_syftpub(yaml_path)
+        _permission_cache.clear()
+        self.assertIsNot(_load_syftpub(yaml_path), first)
+
+    def test_load_missing_or_invalid_yaml_returns_none(self):
+        """Missing and unparsable files are reported as absent."""
+        yaml_path = Path(self.test_dir) / "syft.pub.yaml"
+        self.assertIsNone(_load_syftpub(yaml_path))
+
+        yaml_path.write_text("rules: [unclosed")
+        self.assertIsNone(_load_syftpub(yaml_path))
+
+    def test_load_decodes_non_ascii_users(self):
+        """Files are read as bytes and decoded by the yaml loader."""
+        target = Path(self.test_dir)
+        update_syftpub_yaml(target, "**", {"read": ["jürgen@example.com"]})
+
+        sorted_rules, _ = _load_syftpub(target / "syft.pub.yaml")
+        self.assertEqual(sorted_rules[0]["access"]["read"], ["jürgen@example.com"])
+
+    def test_loaded_rules_are_indexed_by_pattern(self):
+        """Rules sharing a pattern are indexed in their sorted order."""
+        yaml_path = Path(self.test_dir) / "syft.pub.yaml"
+        yaml_path.write_text(
+            "rules:\n"
+            "- pattern: '**'\n  access: {read: [alice@example.com]}\n"
+            "- pattern: '*.txt'\n  access: {read: [bob@example.com]}\n"
+            "- pattern: '**'\n  access: {read: [carol@example.com]}\n"
+        )
+
+        sorted_rules, _ = _load_syftpub(yaml_path)
+        self.assertEqual(
+            [r["access"]["read"] for r in sorted_rules.by_pattern["**"]],
+            [["alice@example.com"], ["carol@example.com"]],
+        )
+        self.assertEqual(sorted_rules.by_pattern["*.txt"], [sorted_rules[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()